@@ -99,6 +99,24 @@ _JURISDICTION_FALLBACK: dict[str, str] = {
 }
 
 
+# Precompiled patterns used on every document. Runs are spelled with a
+# literal prefix ("\n\n\n+" rather than "\n{3,}") so the regex engine can
+# skip ahead to candidate positions instead of trying every character.
+_YEAR_DIR_RE = re.compile(r"/(\d{4})/")
+_YEAR_PREFIX_RE = re.compile(r"/(\d{4})_")
+_C1_RE = re.compile(r"[\x80-\x9f]")
+_MD_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_DASH_RUN_RE = re.compile(r"--+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_BODY_MARKER_RE = re.compile(r"\*{0,4}ΚΕΙΜΕΝΟ ΑΠΟΦΑΣΗΣ\*{0,4}")
+_BODY_MARKER_COLON_RE = re.compile(r"\*{0,4}ΚΕΙΜΕΝΟ ΑΠΟΦΑΣΗΣ\*{0,4}:?")
+_REFS_MARKER_RE = re.compile(r"\*{0,4}ΑΝΑΦΟΡΕΣ\*{0,4}")
+_CROSS_REF_RE = re.compile(r"\]\(([^)]*\.md)\)")
+_HRULE_RE = re.compile(r"^[-_]{3,}$", re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r"\n\n\n+")
+_SPACE_RUN_RE = re.compile(r"  +")
+
+
 @dataclass
 class Chunk:
     """A single text chunk from a court case document."""
@@ -151,10 +169,10 @@ def _detect_year(rel_path: str) -> str:
     Tries /YYYY/ directory first, then YYYY_ prefix in filename
     (for rscc/jsc paths like rscc/files/1961_1_0001.md).
     """
-    m = re.search(r"/(\d{4})/", rel_path)
+    m = _YEAR_DIR_RE.search(rel_path)
     if m:
         return m.group(1)
-    m = re.search(r"/(\d{4})_", rel_path)
+    m = _YEAR_PREFIX_RE.search(rel_path)
     return m.group(1) if m else ""
 
 
@@ -180,7 +198,7 @@ def _extract_title(text: str) -> str:
         return ""
     # Clean markdown and C1 control chars
     cleaned = _clean_markdown(raw)
-    cleaned = re.sub(r"[\x80-\x9f]", "", cleaned)
+    cleaned = _C1_RE.sub("", cleaned)
     return cleaned
 
 
@@ -192,14 +210,27 @@ def _clean_markdown(line: str) -> str:
     """
     cleaned = line.replace("*", "").replace("#", "")
     # Strip markdown links: [text](url) → text
-    cleaned = re.sub(r"\[([^\]]*)\]\([^)]*\)", r"\1", cleaned)
-    cleaned = re.sub(r"[\x80-\x9f]", "-", cleaned)  # C1 control chars → dash (often broken en-dash)
+    cleaned = _MD_LINK_RE.sub(r"\1", cleaned)
+    cleaned = _C1_RE.sub("-", cleaned)  # C1 control chars → dash (often broken en-dash)
     cleaned = cleaned.replace("\u2011", "-")  # non-breaking hyphen
-    cleaned = re.sub(r"-{2,}", "-", cleaned)  # collapse multiple dashes
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    cleaned = _DASH_RUN_RE.sub("-", cleaned)  # collapse multiple dashes
+    cleaned = _WHITESPACE_RE.sub(" ", cleaned).strip()
     return cleaned
 
 
+def _search_marker(pattern: re.Pattern, literal: str, text: str) -> Optional[re.Match]:
+    """Search for a ``\\*{0,4}LITERAL...`` section marker.
+
+    The leading optional asterisks stop the regex engine from skipping
+    ahead, so find the literal with str.find first and start the search
+    at most 4 characters before it (no match can start earlier).
+    """
+    i = text.find(literal)
+    if i < 0:
+        return None
+    return pattern.search(text, max(0, i - 4))
+
+
 def _extract_jurisdiction(text: str, doc_id: str) -> str:
     """Extract jurisdiction line from document body.
 
@@ -209,9 +240,9 @@ def _extract_jurisdiction(text: str, doc_id: str) -> str:
 
     Falls back to path-based jurisdiction when not found in text.
     """
-    parts = re.split(r"\*{0,4}ΚΕΙΜΕΝΟ ΑΠΟΦΑΣΗΣ\*{0,4}", text, maxsplit=1)
-    if len(parts) >= 2:
-        for line in parts[1].split("\n")[:30]:
+    body = _search_marker(_BODY_MARKER_RE, "ΚΕΙΜΕΝΟ ΑΠΟΦΑΣΗΣ", text)
+    if body:
+        for line in text[body.end():].split("\n")[:30]:
             cleaned = _clean_markdown(line)
             if "ΔΙΚΑΙΟΔΟΣΙΑ" in cleaned:
                 return cleaned
@@ -231,8 +262,8 @@ def _strip_references(text: str) -> str:
     keeping the title (before ΑΝΑΦΟΡΕΣ) and decision text (after ΚΕΙΜΕΝΟ ΑΠΟΦΑΣΗΣ).
     Returns text unchanged if markers not found.
     """
-    refs_match = re.search(r"\*{0,4}ΑΝΑΦΟΡΕΣ\*{0,4}", text)
-    body_match = re.search(r"\*{0,4}ΚΕΙΜΕΝΟ ΑΠΟΦΑΣΗΣ\*{0,4}:?", text)
+    refs_match = _search_marker(_REFS_MARKER_RE, "ΑΝΑΦΟΡΕΣ", text)
+    body_match = _search_marker(_BODY_MARKER_COLON_RE, "ΚΕΙΜΕΝΟ ΑΠΟΦΑΣΗΣ", text)
 
     if not refs_match:
         # No ΑΝΑΦΟΡΕΣ section — just strip the ΚΕΙΜΕΝΟ ΑΠΟΦΑΣΗΣ marker if present
@@ -255,7 +286,7 @@ def _extract_cross_refs(text: str) -> list[str]:
     Finds patterns like [case name](/path/to/case.md) and returns
     the unique list of referenced paths.
     """
-    refs = re.findall(r"\]\(([^)]*\.md)\)", text)
+    refs = _CROSS_REF_RE.findall(text)
     return list(dict.fromkeys(refs))  # dedupe, preserve order
 
 
@@ -272,12 +303,12 @@ def _clean_chunk_text(text: str) -> str:
 
     # 2. Strip markdown link syntax: [text](/path) -> text
     #    Loop handles nested links exposed after * removal.
-    _link_re = re.compile(r"\[([^\]]*)\]\([^)]*\)")
-    while _link_re.search(text):
-        text = _link_re.sub(r"\1", text)
+    n = 1
+    while n:
+        text, n = _MD_LINK_RE.subn(r"\1", text)
 
     # 3. Remove C1 control chars (broken encoding artifacts: €, quotes, dashes)
-    text = re.sub(r"[\x80-\x9f]", "", text)
+    text = _C1_RE.sub("", text)
 
     # 4. Normalize invisible unicode
     text = text.replace("\u00a0", " ")   # NBSP → regular space
@@ -286,11 +317,11 @@ def _clean_chunk_text(text: str) -> str:
     text = text.replace("\u0358", "")    # combining dot → remove
 
     # 5. Remove horizontal rules (3+ dashes or underscores on a line)
-    text = re.sub(r"^[-_]{3,}$", "", text, flags=re.MULTILINE)
+    text = _HRULE_RE.sub("", text)
 
     # 6. Collapse whitespace
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r" {2,}", " ", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
+    text = _SPACE_RUN_RE.sub(" ", text)
 
     return text.strip()
 
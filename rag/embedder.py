@@ -7,6 +7,7 @@ Each backend writes to its own ChromaDB directory.
 import json
 import logging
 import os
+import re
 import time
 from pathlib import Path
 
@@ -14,9 +15,19 @@ import chromadb
 
 from rag.chunker import Chunk
 from rag.config import EmbeddingBackend, get_backend
+from rag.ratelimit import AdaptiveLimiter, retry_after_seconds
 
 logger = logging.getLogger(__name__)
 
+# Starting request ceiling for the OpenAI embeddings API; replaced by the
+# account's x-ratelimit-limit-requests once the first response arrives.
+OPENAI_MAX_RPS = 50.0
+
+# Parts of an x-ratelimit-reset-tokens value such as '1m30s' or '120ms'
+_RESET_MINUTES_RE = re.compile(r"([\d.]+)m(?!s)")
+_RESET_SECONDS_RE = re.compile(r"([\d.]+)s")
+_RESET_MILLIS_RE = re.compile(r"([\d.]+)ms")
+
 
 class Embedder:
     """Embeds chunks and stores them in ChromaDB."""
@@ -38,6 +49,8 @@ class Embedder:
             if not api_key:
                 raise ValueError("OPENAI_API_KEY required.")
             self._openai_client = OpenAI(api_key=api_key)
+            # Shared by every ingest thread using this embedder
+            self._limiter = AdaptiveLimiter(max_rate=OPENAI_MAX_RPS)
 
         # Initialize ChromaDB
         os.makedirs(self._backend.chromadb_dir, exist_ok=True)
@@ -62,9 +75,10 @@ class Embedder:
 
     def _save_progress(self) -> None:
         self._progress_file.parent.mkdir(parents=True, exist_ok=True)
-        self._progress_file.write_text(
-            json.dumps(self._progress, ensure_ascii=False)
-        )
+        # Write-then-rename so a crash mid-write never truncates the file
+        tmp = self._progress_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._progress, ensure_ascii=False))
+        os.replace(tmp, self._progress_file)
 
     def get_done_docs(self) -> set[str]:
         return set(self._progress.get("embedded_docs", []))
@@ -94,12 +108,18 @@ class Embedder:
 
     def _embed_openai(self, texts: list[str]) -> list[list[float]]:
         for attempt in range(5):
+            self._limiter.wait()
             try:
                 resp = self._openai_client.embeddings.with_raw_response.create(
                     model=self._backend.model,
                     input=texts,
                 )
+                self._limiter.record_success()
+
                 # Parse rate limit headers for pacing
+                limit_requests = resp.headers.get("x-ratelimit-limit-requests")
+                if limit_requests and limit_requests.isdigit():
+                    self._limiter.set_max_rate(int(limit_requests) / 60)
                 remaining_tokens = int(
                     resp.headers.get("x-ratelimit-remaining-tokens", "999999")
                 )
@@ -110,23 +130,30 @@ class Embedder:
                 parsed = resp.parse()
                 embeddings = [item.embedding for item in parsed.data]
 
-                # If we've used most of the token budget, wait for reset
+                # If we've used most of the token budget, hold every
+                # thread until it resets
                 if remaining_tokens < 100_000 and reset_secs > 0:
                     logger.info(
                         "Pacing: %d tokens remaining, waiting %.1fs",
                         remaining_tokens, reset_secs,
                     )
-                    time.sleep(reset_secs)
+                    self._limiter.pause(reset_secs)
 
                 return embeddings
 
             except Exception as exc:
-                wait = min(2 ** attempt, 30)
+                response = getattr(exc, "response", None)
+                wait = retry_after_seconds(
+                    getattr(response, "headers", None), attempt, cap=30,
+                )
                 logger.warning(
-                    "API error (attempt %d/5), retry in %ds: %s",
+                    "API error (attempt %d/5), retry in %.1fs: %s",
                     attempt + 1, wait, str(exc)[:100],
                 )
-                time.sleep(wait)
+                if getattr(exc, "status_code", None) == 429:
+                    self._limiter.record_429(wait)
+                else:
+                    time.sleep(wait)
         raise RuntimeError("Failed to embed after 5 retries")
 
     # ── Store ──────────────────────────────────────────────────────
@@ -165,14 +192,16 @@ class Embedder:
 
 
 def _parse_reset(value: str) -> float:
-    """Parse x-ratelimit-reset-tokens like '44.169s' or '1m30s'."""
-    import re
-
+    """Parse x-ratelimit-reset-tokens like '44.169s', '1m30s' or '120ms'."""
     total = 0.0
-    m = re.search(r"([\d.]+)m", value)
+    m = _RESET_MINUTES_RE.search(value)
     if m:
         total += float(m.group(1)) * 60
-    m = re.search(r"([\d.]+)s", value)
+    m = _RESET_SECONDS_RE.search(value)
     if m:
         total += float(m.group(1))
+    m = _RESET_MILLIS_RE.search(value)
+    if m:
+        total += float(m.group(1)) / 1000
     return total
+
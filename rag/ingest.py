@@ -11,9 +11,10 @@ Both can run in parallel — they write to different ChromaDB directories.
 import argparse
 import logging
 import multiprocessing
+import os
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -38,6 +39,22 @@ def _chunk_file(args: tuple) -> list[dict]:
         return []
 
 
+def _find_doc_ids(root: str) -> list[str]:
+    """List the .md files under root as paths relative to it, in path order.
+
+    Walks with os.walk (scandir-based) on plain strings instead of
+    Path.rglob, so no Path object is built per file.
+    """
+    prefix_len = len(root.rstrip(os.sep)) + 1
+    doc_ids = []
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            if name.endswith(".md"):
+                doc_ids.append(os.path.join(dirpath, name)[prefix_len:])
+    doc_ids.sort(key=lambda p: p.split(os.sep))
+    return doc_ids
+
+
 def run_ingest(
     input_dir: str,
     provider: str,
@@ -59,13 +76,10 @@ def run_ingest(
     if batch_size is None:
         batch_size = 256 if provider == "local" else 100
 
-    # Collect files
-    md_files = sorted(input_path.rglob("*.md"))
+    # Collect files as doc ids (paths relative to input_dir)
+    md_files = _find_doc_ids(str(input_path))
     if court:
-        md_files = [
-            f for f in md_files
-            if _detect_court(str(f.relative_to(input_path))) == court
-        ]
+        md_files = [f for f in md_files if _detect_court(f) == court]
     if limit:
         md_files = md_files[:limit]
 
@@ -78,30 +92,18 @@ def run_ingest(
     print(f"  Batch:    {batch_size}")
     print(f"{'=' * 60}")
 
-    # Step 1: Chunk
-    ncpu = multiprocessing.cpu_count()
-    print(f"\n[1/2] Chunking ({ncpu} cores)...")
-    t0 = time.time()
-    work = [(str(f), str(input_path)) for f in md_files]
-
-    all_dicts: list[dict] = []
-    with multiprocessing.Pool() as pool:
-        for result in tqdm(
-            pool.imap_unordered(_chunk_file, work, chunksize=100),
-            total=len(md_files), desc="Chunking", unit="docs",
-        ):
-            all_dicts.extend(result)
-
-    print(f"  {len(all_dicts):,} chunks in {time.time()-t0:.1f}s")
-
-    # Step 2: Embed
+    # Resume: skip whole documents embedded by an earlier run
     done_docs = embedder.get_done_docs()
-    new_chunks = [Chunk(**d) for d in all_dicts if d["doc_id"] not in done_docs]
-    skipped = len(all_dicts) - len(new_chunks)
+    work = [
+        (os.path.join(input_path, f), str(input_path)) for f in md_files
+        if f not in done_docs
+    ]
+    del done_docs
+    skipped = len(md_files) - len(work)
 
     if skipped:
-        print(f"  Resuming: {skipped:,} chunks already done")
-    if not new_chunks:
+        print(f"  Resuming: {skipped:,} documents already done")
+    if not work:
         print("  All chunks already embedded!")
         _print_stats(embedder)
         return
@@ -109,62 +111,69 @@ def run_ingest(
     # Parallel threads for OpenAI, sequential for local
     n_threads = 5 if provider == "openai" else 1
 
-    print(f"\n[2/2] Embedding {len(new_chunks):,} chunks ({n_threads} threads)...")
+    # Chunking and embedding are streamed: chunks are batched as the
+    # worker pool produces them, so memory stays flat with corpus size
+    ncpu = multiprocessing.cpu_count()
+    print(f"\nChunking ({ncpu} cores) and embedding ({n_threads} threads)...")
     t1 = time.time()
 
-    # Build all batches upfront
-    all_batches: list[tuple[list[str], list[Chunk]]] = []
-    buf_texts: list[str] = []
-    buf_objs: list[Chunk] = []
-    for c in new_chunks:
-        buf_texts.append(c.text)
-        buf_objs.append(c)
-        if len(buf_texts) >= batch_size:
-            all_batches.append((list(buf_texts), list(buf_objs)))
-            buf_texts, buf_objs = [], []
-    if buf_texts:
-        all_batches.append((list(buf_texts), list(buf_objs)))
-
-    pbar = tqdm(
-        total=len(new_chunks), desc="Embedding", unit="ch",
-        bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]",
-    )
+    pbar = tqdm(desc="Embedding", unit="ch")
 
+    total_chunks = 0
     total_embedded = 0
     all_done_docs: set[str] = set()
 
-    def _process_batch(batch_data):
-        texts, chunks = batch_data
-        embedder.store_batch(texts, chunks)
+    def _iter_batches(pool):
+        nonlocal total_chunks
+        buf: list[Chunk] = []
+        for result in pool.imap_unordered(_chunk_file, work, chunksize=100):
+            buf.extend(Chunk(**d) for d in result)
+            total_chunks += len(result)
+            while len(buf) >= batch_size:
+                yield buf[:batch_size]
+                buf = buf[batch_size:]
+        if buf:
+            yield buf
+
+    def _process_batch(chunks):
+        embedder.store_batch([c.text for c in chunks], chunks)
         return {c.doc_id for c in chunks}, len(chunks)
 
-    if n_threads > 1:
-        with ThreadPoolExecutor(max_workers=n_threads) as executor:
-            futures = {executor.submit(_process_batch, b): i for i, b in enumerate(all_batches)}
-            for f in as_completed(futures):
-                try:
-                    doc_ids, count = f.result()
-                    total_embedded += count
-                    all_done_docs.update(doc_ids)
-                    pbar.update(count)
-
-                    if total_embedded % 5000 < batch_size:
-                        embedder.mark_docs_done(list(all_done_docs), total_embedded)
-                        all_done_docs = set()
-                        total_embedded = 0
-                except Exception as exc:
-                    logger.error("Batch failed: %s", exc)
-    else:
-        for batch_data in all_batches:
-            doc_ids, count = _process_batch(batch_data)
-            total_embedded += count
-            all_done_docs.update(doc_ids)
-            pbar.update(count)
-
-            if total_embedded % 5000 < batch_size:
-                embedder.mark_docs_done(list(all_done_docs), total_embedded)
-                all_done_docs = set()
-                total_embedded = 0
+    def _record(doc_ids, count):
+        nonlocal total_embedded, all_done_docs
+        total_embedded += count
+        all_done_docs.update(doc_ids)
+        pbar.update(count)
+
+        if total_embedded % 5000 < batch_size:
+            embedder.mark_docs_done(list(all_done_docs), total_embedded)
+            all_done_docs = set()
+            total_embedded = 0
+
+    with multiprocessing.Pool() as pool:
+        if n_threads > 1:
+            # At most two batches per thread in flight; the chunker waits
+            # for the embedder instead of racing ahead of it
+            with ThreadPoolExecutor(max_workers=n_threads) as executor:
+                pending = set()
+
+                def _drain(return_when):
+                    nonlocal pending
+                    done, pending = wait(pending, return_when=return_when)
+                    for f in done:
+                        try:
+                            _record(*f.result())
+                        except Exception as exc:
+                            logger.error("Batch failed: %s", exc)
+
+                for batch in _iter_batches(pool):
+                    pending.add(executor.submit(_process_batch, batch))
+                    if len(pending) >= n_threads * 2:
+                        _drain(FIRST_COMPLETED)
+                _drain(ALL_COMPLETED)
+        else:
+            for batch in _iter_batches(pool):
+                _record(*_process_batch(batch))
 
     pbar.close()
 
@@ -172,8 +181,8 @@ def run_ingest(
         embedder.mark_docs_done(list(all_done_docs), total_embedded)
 
     elapsed = time.time() - t1
-    rate = len(new_chunks) / elapsed if elapsed > 0 else 0
-    print(f"  {len(new_chunks):,} chunks in {elapsed:.0f}s ({rate:.0f}/sec)")
+    rate = total_chunks / elapsed if elapsed > 0 else 0
+    print(f"  {total_chunks:,} chunks in {elapsed:.0f}s ({rate:.0f}/sec)")
 
     _print_stats(embedder)
 
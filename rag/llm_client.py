@@ -124,6 +124,28 @@ MODELS = {
 MAX_TOOL_ROUNDS = 5
 
 
+# SDK clients are created once per process and shared by every chat, so
+# their connection pools keep TLS sessions to the API open between turns
+_openai_client = None
+_anthropic_client = None
+
+
+def _get_openai_client():
+    global _openai_client
+    if _openai_client is None:
+        from openai import OpenAI
+        _openai_client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    return _openai_client
+
+
+def _get_anthropic_client():
+    global _anthropic_client
+    if _anthropic_client is None:
+        from anthropic import Anthropic
+        _anthropic_client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    return _anthropic_client
+
+
 def _get_system(translate: bool) -> str:
     prompt = SYSTEM_PROMPT
     if translate:
@@ -179,9 +201,7 @@ async def _chat_openai(
     search_fn,
 ) -> AsyncIterator[dict]:
     """OpenAI chat with function calling and streaming."""
-    from openai import OpenAI
-
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    client = _get_openai_client()
     model_id = model_cfg["model_id"]
 
     # Build messages with system prompt
@@ -284,9 +304,7 @@ async def _chat_claude(
     search_fn,
 ) -> AsyncIterator[dict]:
     """Anthropic Claude chat with tool use and streaming."""
-    from anthropic import Anthropic
-
-    client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    client = _get_anthropic_client()
     model_id = model_cfg["model_id"]
 
     api_messages = list(messages)
@@ -7,9 +7,12 @@ to Cloudflare Vectorize via the HTTP API in NDJSON batches.
 Usage:
     python -m rag.migrate_to_cloudflare
     python -m rag.migrate_to_cloudflare --limit 1000  # test with small batch
+    python -m rag.migrate_to_cloudflare --restart     # ignore saved progress
 """
 
 import argparse
+import collections
+import concurrent.futures
 import hashlib
 import json
 import logging
@@ -17,11 +20,17 @@ import os
 import sys
 import time
 from pathlib import Path
+from typing import Iterable, Iterator
 
 import requests as http_requests
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
 MAX_VECTOR_ID_BYTES = 64
 
 
@@ -37,6 +46,8 @@ load_dotenv()
 
 import chromadb
 
+from rag.ratelimit import AdaptiveLimiter, retry_after_seconds
+
 logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -50,8 +61,21 @@ CF_INDEX_NAME = "cylaw-cases"
 CHROMADB_DIR = str(PROJECT_ROOT / "data" / "chromadb_openai")
 COLLECTION_NAME = "cylaw_openai"
 
+# Chroma IDs already upserted, one per line; lets an interrupted run resume
+PROGRESS_FILE = PROJECT_ROOT / "data" / "migrate_cloudflare_progress.txt"
+
 # Batch size: max 5000 per NDJSON file per Cloudflare docs
-BATCH_SIZE = 2000
+BATCH_SIZE = 5000
+# Split a batch into several requests once its NDJSON body would exceed
+# this size (Cloudflare caps API bodies at 100 MB)
+MAX_BODY_MB = 90
+
+# Cloudflare API has 1200 req/5min = 4/sec; halved on every 429
+CF_MAX_RPS = 4.0
+_LIMITER = AdaptiveLimiter(max_rate=CF_MAX_RPS)
+
+UPLOAD_WORKERS = 4      # parallel uploads (share the session and limiter)
+MAX_QUEUED_BATCHES = 4  # Chroma pages read ahead of the upload workers
 
 
 def get_cf_url(endpoint: str = "") -> str:
@@ -62,31 +86,159 @@ def cf_headers() -> dict:
     return {"Authorization": f"Bearer {CF_API_TOKEN}"}
 
 
-def upload_ndjson_batch(vectors: list[dict]) -> dict:
-    """Upload a batch of vectors as NDJSON to Cloudflare Vectorize.
+def _json_default(obj):
+    """Encode NumPy arrays/scalars that Chroma may hand back."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj) -> bytes:
+    """Compact UTF-8 JSON for one NDJSON line (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=_json_default
+    ).encode("utf-8")
 
-    Each vector: {"id": "...", "values": [...], "metadata": {...}}
+
+def make_session() -> http_requests.Session:
+    """Session that keeps the TLS connection to api.cloudflare.com alive.
+
+    Retries stay with the caller (max_retries=0) so a failed batch is
+    logged and counted instead of silently re-sent by urllib3.
     """
-    # Build NDJSON content
-    ndjson_lines = []
-    for v in vectors:
-        ndjson_lines.append(json.dumps(v, ensure_ascii=False))
-    ndjson_content = "\n".join(ndjson_lines)
-
-    resp = http_requests.post(
-        get_cf_url("/upsert"),
-        headers=cf_headers(),
-        files={"vectors": ("vectors.ndjson", ndjson_content.encode("utf-8"))},
+    session = http_requests.Session()
+    session.mount(
+        "https://",
+        http_requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=8, max_retries=0,
+        ),
     )
+    return session
+
 
-    if resp.status_code != 200:
+def iter_ndjson_bodies(
+    lines: Iterable[bytes], max_bytes: int,
+) -> Iterator[tuple[bytearray, int]]:
+    """Join encoded NDJSON lines into bodies of at most max_bytes each.
+
+    Lines are appended to one growing buffer as they are produced, so a
+    body is never held twice (as a list of lines and as their join). A
+    line larger than max_bytes on its own still gets its own body.
+
+    Yields:
+        (ndjson_body, line_count) tuples.
+    """
+    body = bytearray()
+    count = 0
+    for line in lines:
+        if count and len(body) + 1 + len(line) > max_bytes:
+            yield body, count
+            body = bytearray()
+            count = 0
+        if count:
+            body += b"\n"
+        body += line
+        count += 1
+    if count:
+        yield body, count
+
+
+def upload_ndjson_batch(session: http_requests.Session, ndjson_content: bytes | bytearray) -> dict:
+    """Upload an NDJSON body of vectors to Cloudflare Vectorize.
+
+    Each line: {"id": "...", "values": [...], "metadata": {...}}
+    Requests are paced by the shared limiter and retried on 429.
+    """
+    for attempt in range(5):
+        _LIMITER.wait()
+        resp = session.post(
+            get_cf_url("/upsert"),
+            headers={**cf_headers(), "Content-Type": "application/x-ndjson"},
+            data=ndjson_content,
+        )
+        if resp.status_code != 429:
+            break
+        retry_after = retry_after_seconds(resp.headers, attempt, base=3)
+        logger.warning("Rate limited, retrying in %.0fs", retry_after)
+        _LIMITER.record_429(retry_after)
+
+    if resp.status_code == 200:
+        _LIMITER.record_success()
+    else:
         logger.error("Upload failed: %d %s", resp.status_code, resp.text[:300])
 
     return resp.json()
 
 
-def migrate(limit: int = None) -> None:
-    """Read from ChromaDB and upload to Cloudflare Vectorize."""
+def upload_results(
+    session: http_requests.Session, results: dict, max_body_bytes: int,
+) -> tuple[list[str], int, int]:
+    """Convert one Chroma get() page to Vectorize vectors and upload it.
+
+    Runs on an upload worker thread, so the NDJSON encoding of one batch
+    overlaps the Chroma read of the next.
+
+    Returns:
+        (Chroma IDs uploaded, failed requests, vectors in the page).
+    """
+    uploaded_ids: list[str] = []
+    errors = 0
+
+    # Convert to Cloudflare format
+    cf_vectors = []
+    for i, vec_id in enumerate(results["ids"]):
+        metadata = results["metadatas"][i] if results["metadatas"] else {}
+
+        # Include chunk text in metadata (Cloudflare allows 10 KiB)
+        if results["documents"] and results["documents"][i]:
+            metadata["text"] = results["documents"][i][:4000]  # stay under 10 KiB
+
+        doc_id = metadata.get("doc_id", vec_id.split("::")[0])
+        chunk_idx = metadata.get("chunk_index", 0)
+        cf_vectors.append({
+            "id": make_vector_id(doc_id, chunk_idx),
+            "values": results["embeddings"][i],
+            "metadata": metadata,
+        })
+
+    # Upload to Cloudflare
+    start = 0
+    lines = (_dumps(v) for v in cf_vectors)
+    for body, count in iter_ndjson_bodies(lines, max_body_bytes):
+        body_ids = results["ids"][start:start + count]
+        start += count
+        try:
+            result = upload_ndjson_batch(session, body)
+            if result.get("success"):
+                uploaded_ids.extend(body_ids)
+            else:
+                errors += 1
+                logger.error("Batch error: %s", result.get("errors", []))
+        except Exception as exc:
+            errors += 1
+            logger.error("Upload exception: %s", exc)
+
+    return uploaded_ids, errors, len(cf_vectors)
+
+
+def load_progress() -> set[str]:
+    """Chroma IDs uploaded by earlier runs (empty if none)."""
+    if not PROGRESS_FILE.exists():
+        return set()
+    with open(PROGRESS_FILE, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def migrate(
+    limit: int = None, max_body_mb: float = MAX_BODY_MB, restart: bool = False,
+) -> None:
+    """Read from ChromaDB and upload to Cloudflare Vectorize.
+
+    Vectors recorded in PROGRESS_FILE by an earlier run are skipped
+    unless ``restart`` is set.
+    """
     if not CF_ACCOUNT_ID or not CF_API_TOKEN:
         print("Set CLOUDFLARE_ACCOUNT_ID and CLOUDFLARE_API_TOKEN in .env")
         sys.exit(1)
@@ -102,70 +254,75 @@ def migrate(limit: int = None) -> None:
         total = min(total, limit)
         print(f"Limiting to {total:,} vectors")
 
+    # One session for the whole run: reuses the TLS connection per batch
+    session = make_session()
+
     # Check current Cloudflare index
-    resp = http_requests.get(get_cf_url(), headers=cf_headers())
+    resp = session.get(get_cf_url(), headers=cf_headers())
     cf_info = resp.json()
     print(f"Cloudflare index: {CF_INDEX_NAME}")
     print(f"  Dimensions: {cf_info['result']['config']['dimensions']}")
     print(f"  Metric: {cf_info['result']['config']['metric']}")
 
+    # Fetch every ID once (cheap: no embeddings/documents), then read the
+    # pages by ID. Offset paging re-scans all skipped rows on every call,
+    # which makes a full export quadratic in collection size.
+    all_ids = collection.get(limit=total, include=[])["ids"]
+
+    if restart:
+        PROGRESS_FILE.unlink(missing_ok=True)
+    done = load_progress()
+    if done:
+        all_ids = [vec_id for vec_id in all_ids if vec_id not in done]
+        print(f"Resuming: {len(done):,} vectors already uploaded, {len(all_ids):,} to go")
+    del done
+    PROGRESS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    progress_out = open(PROGRESS_FILE, "a", encoding="utf-8")
+
     # Read and upload in batches
-    print(f"\nMigrating {total:,} vectors (batch size: {BATCH_SIZE})...")
+    print(f"\nMigrating {len(all_ids):,} vectors (batch size: {BATCH_SIZE})...")
     t0 = time.time()
     uploaded = 0
     errors = 0
 
-    pbar = tqdm(total=total, desc="Uploading", unit="vecs",
+    pbar = tqdm(total=len(all_ids), desc="Uploading", unit="vecs",
                 bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]")
 
-    offset = 0
-    while offset < total:
-        batch_size = min(BATCH_SIZE, total - offset)
-
+    max_body_bytes = int(max_body_mb * 1024 * 1024)
+    upload_pool = concurrent.futures.ThreadPoolExecutor(max_workers=UPLOAD_WORKERS)
+    pending: collections.deque = collections.deque()
+
+    def finish_oldest() -> None:
+        nonlocal uploaded, errors
+        batch_ids, batch_errors, batch_count = pending.popleft().result()
+        if batch_ids:
+            progress_out.write("\n".join(batch_ids) + "\n")
+            progress_out.flush()
+        uploaded += len(batch_ids)
+        errors += batch_errors
+        pbar.update(batch_count)
+
+    for offset in range(0, len(all_ids), BATCH_SIZE):
         # Read batch from ChromaDB
         results = collection.get(
-            limit=batch_size,
-            offset=offset,
+            ids=all_ids[offset:offset + BATCH_SIZE],
             include=["embeddings", "metadatas", "documents"],
         )
 
         if not results["ids"]:
             break
 
-        # Convert to Cloudflare format
-        cf_vectors = []
-        for i, vec_id in enumerate(results["ids"]):
-            metadata = results["metadatas"][i] if results["metadatas"] else {}
-
-            # Include chunk text in metadata (Cloudflare allows 10 KiB)
-            if results["documents"] and results["documents"][i]:
-                metadata["text"] = results["documents"][i][:4000]  # stay under 10 KiB
-
-            doc_id = metadata.get("doc_id", vec_id.split("::")[0])
-            chunk_idx = metadata.get("chunk_index", 0)
-            cf_vectors.append({
-                "id": make_vector_id(doc_id, chunk_idx),
-                "values": results["embeddings"][i],
-                "metadata": metadata,
-            })
-
-        # Upload to Cloudflare
-        try:
-            result = upload_ndjson_batch(cf_vectors)
-            if result.get("success"):
-                uploaded += len(cf_vectors)
-            else:
-                errors += 1
-                logger.error("Batch error: %s", result.get("errors", []))
-        except Exception as exc:
-            errors += 1
-            logger.error("Upload exception: %s", exc)
-
-        pbar.update(len(cf_vectors))
-        offset += batch_size
+        # Convert, encode and upload on a worker while the next batch is
+        # read; block only when too many batches are queued
+        pending.append(upload_pool.submit(upload_results, session, results, max_body_bytes))
+        while pending and (len(pending) > UPLOAD_WORKERS + MAX_QUEUED_BATCHES
+                           or pending[0].done()):
+            finish_oldest()
 
-        # Rate limit: Cloudflare API has 1200 req/5min = 4/sec
-        time.sleep(0.5)
+    while pending:
+        finish_oldest()
+    upload_pool.shutdown()
+    progress_out.close()
 
     pbar.close()
     elapsed = time.time() - t0
@@ -178,7 +335,7 @@ def migrate(limit: int = None) -> None:
     print(f"{'=' * 50}")
 
     # Verify
-    resp = http_requests.get(
+    resp = session.get(
         get_cf_url("/info"),
         headers=cf_headers(),
     )
@@ -190,6 +347,10 @@ def migrate(limit: int = None) -> None:
 def main():
     parser = argparse.ArgumentParser(description="Migrate ChromaDB → Cloudflare Vectorize")
     parser.add_argument("--limit", type=int, default=None, help="Limit vectors to migrate")
+    parser.add_argument("--max-body-mb", type=float, default=MAX_BODY_MB,
+                        help=f"Max NDJSON body per request in MB (default: {MAX_BODY_MB})")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore saved progress and upload every vector again")
     parser.add_argument("-v", "--verbose", action="store_true")
     args = parser.parse_args()
 
@@ -198,7 +359,7 @@ def main():
         format="%(asctime)s [%(levelname)s] %(message)s",
     )
 
-    migrate(limit=args.limit)
+    migrate(limit=args.limit, max_body_mb=args.max_body_mb, restart=args.restart)
 
 
 if __name__ == "__main__":
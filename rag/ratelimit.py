@@ -0,0 +1,113 @@
+"""Shared adaptive rate limiting for rate-limited HTTP APIs.
+
+One limiter is shared by every thread that talks to the same API, so a
+429 slows the whole process down instead of each thread backing off on
+its own while the others keep firing.
+"""
+
+import random
+import threading
+import time
+
+
+class AdaptiveLimiter:
+    """Thread-safe request pacer that backs off on 429s and recovers slowly.
+
+    Requests are spaced ``1 / rate`` seconds apart across all callers (a
+    token bucket with a burst of one): each caller reserves the next free
+    slot under the lock. A 429 multiplies the rate by ``backoff``; every
+    ``recover_after`` consecutive successes multiply it by ``recovery``,
+    up to ``max_rate``.
+
+    Args:
+        max_rate: Ceiling in requests per second (the API's documented limit).
+        min_rate: Floor in requests per second.
+        backoff: Rate multiplier applied on each 429.
+        recovery: Rate multiplier applied after a run of successes.
+        recover_after: Consecutive successes needed before recovering.
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        min_rate: float = 0.05,
+        backoff: float = 0.5,
+        recovery: float = 1.1,
+        recover_after: int = 10,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._max_rate = max_rate
+        self._min_rate = min(min_rate, max_rate)
+        self._backoff = backoff
+        self._recovery = recovery
+        self._recover_after = recover_after
+        self._rate = max_rate
+        self._next_slot = 0.0
+        self._successes = 0
+
+    @property
+    def rate(self) -> float:
+        """Current allowed requests per second."""
+        with self._lock:
+            return self._rate
+
+    def wait(self) -> None:
+        """Block until this caller's request slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self._rate
+        remaining = slot - now
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def record_success(self) -> None:
+        """Count a successful request; raise the rate after a run of them."""
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self._recover_after:
+                self._successes = 0
+                self._rate = min(self._max_rate, self._rate * self._recovery)
+
+    def record_429(self, retry_after: float = 0.0) -> None:
+        """Cut the rate after a 429 and hold every caller for retry_after seconds."""
+        with self._lock:
+            self._successes = 0
+            self._rate = max(self._min_rate, self._rate * self._backoff)
+            if retry_after > 0:
+                self._next_slot = max(self._next_slot, time.monotonic() + retry_after)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for ``seconds`` without changing the rate."""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+    def set_max_rate(self, max_rate: float) -> None:
+        """Replace the ceiling, e.g. with a limit reported by the API."""
+        with self._lock:
+            self._max_rate = max_rate
+            self._min_rate = min(self._min_rate, max_rate)
+            self._rate = min(self._rate, max_rate)
+
+
+def retry_after_seconds(
+    headers, attempt: int, base: float = 1.0, cap: float = 60.0
+) -> float:
+    """Seconds to wait before retrying a throttled or failed request.
+
+    Uses the response's Retry-After header when there is one, otherwise
+    ``min(base * 2 ** attempt, cap)`` for the 0-based ``attempt``. Up to
+    25% jitter is added either way, so callers throttled together don't
+    all retry together.
+
+    Args:
+        headers: Response headers (case-insensitive mapping), or None.
+        attempt: Number of attempts already made, starting at 0.
+        base: Wait for the first retry when no Retry-After is given.
+        cap: Upper bound for the exponential wait.
+    """
+    try:
+        wait = float(headers.get("Retry-After", ""))
+    except (AttributeError, ValueError):
+        wait = min(base * 2 ** attempt, cap)
+    return wait + random.uniform(0, wait * 0.25)
@@ -5,6 +5,8 @@ Uses the same embedding backend as configured in rag.config.
 
 import logging
 import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -14,6 +16,10 @@ from rag.config import EmbeddingBackend, get_backend
 
 logger = logging.getLogger(__name__)
 
+# Query embeddings kept in memory; repeated searches (including the LLM
+# re-issuing a query within one chat) skip the embedding call
+QUERY_CACHE_SIZE = 1024
+
 
 @dataclass
 class SearchResult:
@@ -55,6 +61,9 @@ class Retriever:
                 raise ValueError("OPENAI_API_KEY required.")
             self._openai = OpenAI(api_key=api_key)
 
+        self._query_cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+
         self._chroma = chromadb.PersistentClient(path=self._backend.chromadb_dir)
         self._collection = self._chroma.get_collection(
             name=self._backend.collection_name
@@ -66,16 +75,28 @@ class Retriever:
         )
 
     def _embed_query(self, query: str) -> list[float]:
+        """Embed a query, serving repeats from an in-memory LRU."""
+        with self._query_cache_lock:
+            emb = self._query_cache.get(query)
+            if emb is not None:
+                self._query_cache.move_to_end(query)
+                return emb
+
         if self._backend.name == "local":
             emb = self._model.encode(
                 [query], normalize_embeddings=True
-            )
-            return emb[0].tolist()
+            )[0].tolist()
         else:
             resp = self._openai.embeddings.create(
                 model=self._backend.model, input=[query],
             )
-            return resp.data[0].embedding
+            emb = resp.data[0].embedding
+
+        with self._query_cache_lock:
+            self._query_cache[query] = emb
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return emb
 
     def search(
         self,
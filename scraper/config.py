@@ -14,6 +14,20 @@ REQUEST_TIMEOUT = 30
 # Maximum retry attempts on server errors
 MAX_RETRIES = 3
 
+# Retry backoff with full jitter: a random wait of up to
+# min(RETRY_BACKOFF_BASE * 2**n, RETRY_BACKOFF_CAP) seconds after failure n
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_CAP = 30.0
+
+# Year pages of one court fetched concurrently (still rate limited)
+SCRAPE_WORKERS = 8
+
+# Courts scraped concurrently under --all (they share one rate limiter)
+COURT_WORKERS = 4
+
+# Keep-alive connections held by the shared fetcher session
+HTTP_POOL_SIZE = 16
+
 # Polite User-Agent identifying this as a research tool
 USER_AGENT = (
     "CyLawIndexScraper/1.0 "
@@ -152,15 +166,17 @@ COURTS: list[CourtConfig] = [
     ),
 ]
 
+_COURTS_BY_ID: dict[str, CourtConfig] = {c.court_id: c for c in COURTS}
+
 UPDATES_URL = f"{BASE_URL}/updates.html"
 
 
 def get_court(court_id: str) -> CourtConfig:
     """Look up a court by its ID. Raises ValueError if not found."""
-    for court in COURTS:
-        if court.court_id == court_id:
-            return court
-    valid_ids = [c.court_id for c in COURTS]
-    raise ValueError(
-        f"Unknown court_id '{court_id}'. Valid IDs: {valid_ids}"
-    )
+    try:
+        return _COURTS_BY_ID[court_id]
+    except KeyError:
+        valid_ids = list(_COURTS_BY_ID)
+        raise ValueError(
+            f"Unknown court_id '{court_id}'. Valid IDs: {valid_ids}"
+        ) from None
@@ -8,11 +8,11 @@ Usage:
     # Test on first 20 files:
     python -m scraper.downloader --limit 20
 
-    # Download everything (30 threads, 0.5s delay):
+    # Download everything (30 threads, up to 60 req/s):
     python -m scraper.downloader
 
     # Custom settings:
-    python -m scraper.downloader --threads 50 --delay 0.3
+    python -m scraper.downloader --threads 50 --rate 100
 """
 
 import argparse
@@ -29,7 +29,9 @@ from typing import Optional
 import requests
 from tqdm import tqdm
 
+from rag.ratelimit import AdaptiveLimiter, retry_after_seconds
 from scraper.config import BASE_URL, USER_AGENT
+from scraper.progress import ProgressDB
 
 logger = logging.getLogger(__name__)
 
@@ -37,12 +39,13 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
 # Default settings
 DEFAULT_THREADS = 30
-DEFAULT_DELAY = 0.5  # seconds between requests per thread
+DEFAULT_RATE = 60.0  # max requests per second across all threads
+MIN_RATE = 1.0  # floor the limiter backs off to under throttling
 DEFAULT_TIMEOUT = 30
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_OUTPUT_DIR = "data/cases"
 DEFAULT_INDEX_DIR = "data/indexes"
-PROGRESS_FILE = "data/download_progress.txt"
+PROGRESS_FILE = "data/download_progress.db"
 
 # Encoding handling — site uses Greek ISO-8859-7
 ENCODINGS_TO_TRY = ("utf-8", "iso-8859-7", "windows-1253")
@@ -74,47 +77,6 @@ class DownloadStats:
             self.errors.append((file_path, error))
 
 
-class ProgressTracker:
-    """Thread-safe progress tracker that persists to disk.
-
-    Records successfully downloaded file_paths so that the download
-    can be resumed after interruption.
-    """
-
-    def __init__(self, progress_file: str) -> None:
-        self._path = Path(progress_file)
-        self._lock = threading.Lock()
-        self._downloaded: set[str] = set()
-        self._load()
-
-    def _load(self) -> None:
-        """Load previously downloaded paths from disk."""
-        if self._path.exists():
-            with open(self._path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        self._downloaded.add(line)
-            logger.info(
-                "Resumed: %d files already downloaded.", len(self._downloaded)
-            )
-
-    def is_done(self, file_path: str) -> bool:
-        """Check if a file has already been downloaded."""
-        return file_path in self._downloaded
-
-    def mark_done(self, file_path: str) -> None:
-        """Record a successful download."""
-        with self._lock:
-            self._downloaded.add(file_path)
-            with open(self._path, "a", encoding="utf-8") as f:
-                f.write(file_path + "\n")
-
-    @property
-    def count(self) -> int:
-        return len(self._downloaded)
-
-
 def collect_unique_file_paths(index_dir: str) -> list[dict]:
     """Read all JSON indexes and collect unique file entries.
 
@@ -141,11 +103,11 @@ def download_one(
     entry: dict,
     output_dir: Path,
     session: requests.Session,
-    delay: float,
+    limiter: AdaptiveLimiter,
     max_retries: int,
     timeout: int,
     stats: DownloadStats,
-    progress: ProgressTracker,
+    progress: ProgressDB,
 ) -> bool:
     """Download a single case file.
 
@@ -153,7 +115,7 @@ def download_one(
         entry: Dict with 'file_path' and 'url'.
         output_dir: Base directory for saving files.
         session: requests.Session (thread-local recommended).
-        delay: Seconds to sleep after each request.
+        limiter: Shared rate limiter, acquired before every request.
         max_retries: Max retry attempts on failure.
         timeout: HTTP timeout in seconds.
         stats: Shared statistics tracker.
@@ -181,14 +143,24 @@ def download_one(
 
     for attempt in range(1, max_retries + 1):
         try:
+            limiter.wait()
             resp = session.get(url, timeout=timeout)
 
             if resp.status_code == 404:
                 # Try the CGI gateway as fallback
                 url_cgi = entry.get("url", "")
                 if url_cgi and "open.pl" in url_cgi:
+                    limiter.wait()
                     resp = session.get(url_cgi, timeout=timeout)
 
+            throttled = resp.status_code in (429, 503)
+            if throttled:
+                # Holds every thread for the Retry-After period, so no
+                # local sleep is needed before retrying
+                limiter.record_429(retry_after_seconds(resp.headers, attempt))
+            elif resp.status_code < 500:
+                limiter.record_success()
+
             if resp.status_code == 200:
                 # Ensure directory exists
                 local_path.parent.mkdir(parents=True, exist_ok=True)
@@ -199,12 +171,9 @@ def download_one(
 
                 progress.mark_done(file_path)
                 stats.record_download(len(content))
-
-                if delay > 0:
-                    time.sleep(delay)
                 return True
 
-            if resp.status_code >= 500:
+            if resp.status_code == 429 or resp.status_code >= 500:
                 logger.debug(
                     "Server error %d for %s (attempt %d/%d)",
                     resp.status_code,
@@ -212,15 +181,14 @@ def download_one(
                     attempt,
                     max_retries,
                 )
-                time.sleep(2 ** attempt)
+                if not throttled:
+                    time.sleep(2 ** attempt)
                 continue
 
             # 4xx error — don't retry
             stats.record_failure(
                 file_path, f"HTTP {resp.status_code}"
             )
-            if delay > 0:
-                time.sleep(delay)
             return False
 
         except requests.RequestException as exc:
@@ -257,7 +225,7 @@ def run_download(
     entries: list[dict],
     output_dir: str,
     threads: int = DEFAULT_THREADS,
-    delay: float = DEFAULT_DELAY,
+    rate: float = DEFAULT_RATE,
     max_retries: int = DEFAULT_MAX_RETRIES,
     timeout: int = DEFAULT_TIMEOUT,
     progress_file: str = PROGRESS_FILE,
@@ -269,10 +237,10 @@ def run_download(
         entries: List of entry dicts from the indexes.
         output_dir: Base directory for saving files.
         threads: Number of parallel download threads.
-        delay: Seconds between requests per thread.
+        rate: Max requests per second across all threads.
         max_retries: Max retries per file.
         timeout: HTTP timeout.
-        progress_file: Path to the progress tracking file.
+        progress_file: Path to the SQLite progress database.
         limit: If set, only download this many files (for testing).
 
     Returns:
@@ -281,18 +249,21 @@ def run_download(
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    progress = ProgressTracker(progress_file)
+    progress = ProgressDB(progress_file)
+    if progress.count:
+        logger.info("Resumed: %d files already downloaded.", progress.count)
     stats = DownloadStats()
+    limiter = AdaptiveLimiter(max_rate=rate, min_rate=MIN_RATE)
 
     if limit:
         entries = entries[:limit]
 
     total = len(entries)
     logger.info(
-        "Starting download: %d files, %d threads, %.1fs delay",
+        "Starting download: %d files, %d threads, up to %.1f req/s",
         total,
         threads,
-        delay,
+        rate,
     )
 
     # Thread-local sessions for connection reuse
@@ -311,7 +282,7 @@ def run_download(
                 entry=entry,
                 output_dir=output_path,
                 session=get_session(),
-                delay=delay,
+                limiter=limiter,
                 max_retries=max_retries,
                 timeout=timeout,
                 stats=stats,
@@ -334,6 +305,7 @@ def run_download(
                     refresh=False,
                 )
 
+    progress.close()
     return stats
 
 
@@ -349,10 +321,10 @@ def main() -> None:
         help=f"Number of parallel download threads (default: {DEFAULT_THREADS})",
     )
     parser.add_argument(
-        "--delay",
+        "--rate",
         type=float,
-        default=DEFAULT_DELAY,
-        help=f"Delay between requests per thread in seconds (default: {DEFAULT_DELAY})",
+        default=DEFAULT_RATE,
+        help=f"Max requests per second across all threads; backs off on 429/503 (default: {DEFAULT_RATE})",
     )
     parser.add_argument(
         "--limit",
@@ -400,7 +372,7 @@ def main() -> None:
         entries=entries,
         output_dir=output_dir,
         threads=args.threads,
-        delay=args.delay,
+        rate=args.rate,
         progress_file=progress_file,
         limit=args.limit,
     )
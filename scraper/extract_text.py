@@ -16,17 +16,21 @@ Usage:
 """
 
 import argparse
+import codecs
 import logging
 import multiprocessing
+import os
 import re
 import sys
 import threading
 from collections import Counter, defaultdict
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from html import unescape
 from pathlib import Path
 from typing import Optional
 
-from bs4 import BeautifulSoup, NavigableString, Tag
+import lxml.html
+from lxml import etree
 from tqdm import tqdm
 
 logger = logging.getLogger(__name__)
@@ -48,6 +52,39 @@ FOOTER_MARKERS = [
     "Παγκύπριο Δικηγορικό Σύλλογο",
     "Παγκύπριου Δικηγορικού Συλλόγου",
 ]
+_FOOTER_RE = re.compile("|".join(re.escape(m) for m in FOOTER_MARKERS))
+
+# Courts stored under apofaseis/<court_id>/
+_APOFASEIS_COURTS = {
+    "aad": "aad",
+    "epa": "epa",
+    "aap": "aap",
+    "dioikitiko": "dioikitiko",
+}
+
+# Precompiled patterns for the per-node conversion path
+_ASCII_SPACES = " \n\t\f\r"
+_WS_INLINE = re.compile(r"[ \t]+")
+_MULTI_BLANK = re.compile(r"\n{3,}")
+_TRAILING_WS = re.compile(r"[^\S\n]+$", re.MULTILINE)
+_PIPE_ESCAPE = str.maketrans({"|": "\\|"})
+# A word is a run of characters that are neither whitespace nor Markdown syntax
+_WORD_RE = re.compile(r"[^\s#*_\[\]\(\)|>\-]+")
+_REF_RE = re.compile(r"\]\([^)]*\.md\)")
+_FILE_PARAM = re.compile(r"file=([^&\"'\s]+)")
+_EXT_RE = re.compile(r"\.(html?|htm|pdf)$", re.IGNORECASE)
+_METADATA_RE = re.compile(
+    rb"<!---?sections_start-?--?>.*?<!---?sections_end-?--?>"
+    rb"|<!--sino\s+[^>]+-->"
+    rb"|<!---?noteup_(?:start|end)-?--?>",
+    re.DOTALL,
+)
+_CHARSET_RE = re.compile(rb"""charset=["']?([\w-]+)""", re.IGNORECASE)
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+# Text is already decoded; the forced encoding stops <meta charset> (or an
+# XML declaration) from re-decoding the UTF-8 bytes we hand to libxml2
+_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
 
 
 class ExtractionStats:
@@ -83,42 +120,72 @@ class ExtractionStats:
             self.words_by_format[fmt] += word_count
             self.files_by_format[fmt] += 1
 
-    def record_skip(self) -> None:
+    def record_skip(self, count: int = 1) -> None:
         with self._lock:
-            self.skipped += 1
+            self.skipped += count
 
     def record_failure(self, path: str, error: str) -> None:
         with self._lock:
             self.failed += 1
             self.errors.append((path, error))
 
+    def snapshot(self) -> dict:
+        """Picklable copy of all counters (for returning from workers)."""
+        with self._lock:
+            return {k: v for k, v in vars(self).items() if k != "_lock"}
+
+    def merge(self, snapshot: dict) -> None:
+        """Add the counters from another stats snapshot into this one."""
+        with self._lock:
+            for name, value in snapshot.items():
+                current = getattr(self, name)
+                if isinstance(current, dict):
+                    for key, count in value.items():
+                        current[key] += count
+                else:
+                    setattr(self, name, current + value)
+
+
+def _decode_html(raw: bytes) -> str:
+    """Decode the raw bytes of an HTML file.
+
+    Uses the BOM or the <meta> charset declared near the top of the file;
+    if there is none (or it does not fit the bytes), tries ENCODINGS in
+    order on the same bytes.
+    """
+    if raw.startswith(codecs.BOM_UTF8):
+        return raw.decode("utf-8-sig", errors="replace")
 
-def _read_html(path: Path) -> str:
-    """Read an HTML file trying multiple encodings."""
-    for enc in ENCODINGS:
+    candidates = list(ENCODINGS)
+    m = _CHARSET_RE.search(raw, 0, 4096)
+    if m:
         try:
-            return path.read_text(encoding=enc)
+            declared = codecs.lookup(m.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+        else:
+            candidates.insert(0, declared)
+
+    for enc in candidates:
+        try:
+            return raw.decode(enc)
         except UnicodeDecodeError:
             continue
-    return path.read_bytes().decode("latin-1")
+    return raw.decode("latin-1")
 
 
 def _detect_court(rel_path: Path) -> str:
-    """Detect court from relative path."""
-    path_str = str(rel_path)
-    if "apofaseis/aad" in path_str:
-        return "aad"
-    if "apofaseis/epa" in path_str:
-        return "epa"
-    if "apofaseis/aap" in path_str:
-        return "aap"
-    if "apofaseis/dioikitiko" in path_str:
-        return "dioikitiko"
-    if "clr" in path_str:
-        return "clr"
-    if rel_path.parts:
-        return rel_path.parts[0]
-    return "unknown"
+    """Detect court from relative path.
+
+    Courts live in a top-level directory, except the ones grouped under
+    apofaseis/ (aad, epa, aap, dioikitiko).
+    """
+    parts = rel_path.parts
+    if not parts:
+        return "unknown"
+    if parts[0] == "apofaseis" and len(parts) > 1:
+        return _APOFASEIS_COURTS.get(parts[1], parts[0])
+    return parts[0]
 
 
 def _extract_file_path_from_href(href: str) -> Optional[str]:
@@ -126,7 +193,7 @@ def _extract_file_path_from_href(href: str) -> Optional[str]:
 
     Returns the local .md path that will correspond to the referenced case.
     """
-    m = re.search(r"file=([^&\"'\s]+)", href)
+    m = _FILE_PARAM.search(href)
     if m:
         fp = m.group(1)
         # Normalize: remove leading /apofaseis prefix duplication, etc.
@@ -134,12 +201,16 @@ def _extract_file_path_from_href(href: str) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=4096)
 def _href_to_md_link(href: str) -> Optional[str]:
-    """Convert an open.pl href to a relative path to the .md version."""
+    """Convert an open.pl href to a relative path to the .md version.
+
+    Cached: citations to the same case repeat within and across documents.
+    """
     fp = _extract_file_path_from_href(href)
     if fp:
         # Change extension to .md (handle .html, .htm, .pdf)
-        fp = re.sub(r"\.(html?|htm|pdf)$", ".md", fp, flags=re.IGNORECASE)
+        fp = _EXT_RE.sub(".md", fp)
         if not fp.endswith(".md"):
             fp += ".md"
         return fp
@@ -148,191 +219,230 @@ def _href_to_md_link(href: str) -> Optional[str]:
 
 def _is_footer(text: str) -> bool:
     """Check if text contains a footer marker."""
-    return any(marker in text for marker in FOOTER_MARKERS)
+    return _FOOTER_RE.search(text) is not None
 
 
-def _convert_element(el: Tag, depth: int = 0) -> str:
+def _inline_text(text: str) -> str:
+    """Collapse whitespace in a text node.
+
+    Whitespace-only runs between tags become a single newline or space,
+    the same normalization BeautifulSoup applied when building its tree.
+    """
+    if not text.strip(_ASCII_SPACES):
+        return "\n" if "\n" in text else " "
+    return _WS_INLINE.sub(" ", text)
+
+
+def _convert_element(
+    el: etree._Element, out: list[str], depth: int = 0
+) -> None:
     """Recursively convert an HTML element to Markdown.
 
+    Chunks are appended to ``out`` rather than returned, so wrappers
+    like ``**...**`` or paragraph breaks do not copy the content again.
+
     Args:
-        el: BeautifulSoup Tag or NavigableString.
+        el: lxml element (comments are treated as text nodes).
+        out: Shared list of Markdown chunks, joined once by the caller.
         depth: Nesting depth (to prevent infinite recursion).
-
-    Returns:
-        Markdown string.
     """
-    if depth > 50:
-        return ""
-
-    if isinstance(el, NavigableString):
-        text = str(el)
-        # Collapse whitespace in inline text
-        text = re.sub(r"[ \t]+", " ", text)
-        return text
+    if not isinstance(el.tag, str):
+        # Comment or processing instruction: keep its text inline
+        if el.text:
+            out.append(_inline_text(el.text))
+        return
 
-    if not isinstance(el, Tag):
-        return ""
+    if depth > 50:
+        return
 
-    tag = el.name.lower() if el.name else ""
+    tag = el.tag.lower()
 
     # Skip these entirely
-    if tag in ("script", "style", "meta", "link", "img"):
-        return ""
+    if tag in _SKIP_TAGS:
+        return
+
+    # Inner content: el.text, then each child followed by its tail.
+    # Rendered in place, then taken back out for the empty/footer checks.
+    start = len(out)
+    if el.text:
+        out.append(_inline_text(el.text))
+    for child in el:
+        _convert_element(child, out, depth + 1)
+        if child.tail:
+            out.append(_inline_text(child.tail))
+    content = "".join(out[start:]).strip()
+    del out[start:]
 
-    # Get inner content by recursing into children
-    def inner() -> str:
-        parts = []
-        for child in el.children:
-            if isinstance(child, NavigableString):
-                t = str(child)
-                t = re.sub(r"[ \t]+", " ", t)
-                parts.append(t)
-            elif isinstance(child, Tag):
-                parts.append(_convert_element(child, depth + 1))
-        return "".join(parts)
-
-    content = inner().strip()
     if not content:
-        return ""
+        return
 
     # Check for footer — stop processing
     if _is_footer(content):
-        return ""
+        return
 
-    # --- Block-level elements ---
-
-    if tag in ("h1",):
-        return f"\n\n# {content}\n\n"
-    if tag in ("h2",):
-        return f"\n\n## {content}\n\n"
-    if tag in ("h3",):
-        return f"\n\n### {content}\n\n"
-    if tag in ("h4", "h5", "h6"):
-        return f"\n\n#### {content}\n\n"
-
-    if tag == "p":
-        if not content.strip():
-            return ""
-        return f"\n\n{content}\n\n"
-
-    if tag == "br":
-        return "  \n"
-
-    if tag == "hr":
-        return "\n\n---\n\n"
-
-    if tag == "div":
-        return f"\n\n{content}\n\n"
-
-    if tag == "blockquote":
-        lines = content.split("\n")
-        quoted = "\n".join(f"> {line}" for line in lines if line.strip())
-        return f"\n\n{quoted}\n\n"
-
-    # Lists
-    if tag in ("ul", "dir"):
-        items = []
-        for li in el.find_all("li", recursive=False):
-            li_text = _convert_element(li, depth + 1).strip()
-            if li_text:
-                items.append(f"- {li_text}")
-        # If no <li> found, treat direct children as items
-        if not items:
-            return f"\n\n{content}\n\n"
-        return "\n\n" + "\n".join(items) + "\n\n"
-
-    if tag == "ol":
-        items = []
-        for i, li in enumerate(el.find_all("li", recursive=False), 1):
-            li_text = _convert_element(li, depth + 1).strip()
-            if li_text:
-                items.append(f"{i}. {li_text}")
-        if not items:
-            return f"\n\n{content}\n\n"
-        return "\n\n" + "\n".join(items) + "\n\n"
-
-    if tag == "li":
-        return content
+    handler = _HANDLERS.get(tag)
+    if handler is None:
+        # Default (li, tr, td, sup, sub, span, ...): just the inner content
+        out.append(content)
+    else:
+        handler(content, el, depth, out)
 
-    # Tables — preserve as simple Markdown
-    if tag == "table":
-        return _convert_table(el, depth)
 
-    if tag in ("tr", "td", "th", "thead", "tbody", "tfoot"):
-        return content
+def _convert_to_str(el: etree._Element, depth: int) -> str:
+    """Convert a single element to a standalone Markdown string."""
+    parts: list[str] = []
+    _convert_element(el, parts, depth)
+    return "".join(parts)
 
-    # --- Inline elements ---
 
-    if tag == "a":
-        href = el.get("href", "")
-        if not href or href.startswith("#"):
-            return content
+# --- Tag handlers: append Markdown for (content, element, depth) to out ---
 
-        # Case cross-reference
-        if "open.pl" in href:
-            md_path = _href_to_md_link(href)
-            if md_path:
-                return f"[{content}]({md_path})"
 
-        # Legislation reference
-        if "nomoi" in href or "nomothesia" in href:
-            return f"[{content}]({href})"
+def _block(
+    content: str, el: etree._Element, depth: int, out: list[str]
+) -> None:
+    out += ("\n\n", content, "\n\n")
 
-        # Other external links
-        if href.startswith("http"):
-            return f"[{content}]({href})"
 
-        return content
+def _blockquote(
+    content: str, el: etree._Element, depth: int, out: list[str]
+) -> None:
+    lines = content.split("\n")
+    quoted = "\n".join(f"> {line}" for line in lines if line.strip())
+    out += ("\n\n", quoted, "\n\n")
 
-    if tag == "b" or tag == "strong":
-        if content:
-            return f"**{content}**"
-        return ""
 
-    if tag in ("i", "em"):
-        if content:
-            return f"*{content}*"
-        return ""
+def _list(
+    content: str, el: etree._Element, depth: int, out: list[str],
+    ordered: bool,
+) -> None:
+    items = []
+    for i, li in enumerate(el.findall("li"), 1):
+        li_text = _convert_to_str(li, depth + 1).strip()
+        if li_text:
+            items.append(f"{i}. {li_text}" if ordered else f"- {li_text}")
+    # If no <li> found, treat direct children as items
+    if not items:
+        out += ("\n\n", content, "\n\n")
+        return
+    out += ("\n\n", "\n".join(items), "\n\n")
+
+
+def _unordered_list(
+    content: str, el: etree._Element, depth: int, out: list[str]
+) -> None:
+    _list(content, el, depth, out, ordered=False)
+
+
+def _ordered_list(
+    content: str, el: etree._Element, depth: int, out: list[str]
+) -> None:
+    _list(content, el, depth, out, ordered=True)
+
+
+def _anchor(
+    content: str, el: etree._Element, depth: int, out: list[str]
+) -> None:
+    href = el.get("href", "")
+    if not href or href.startswith("#"):
+        out.append(content)
+        return
+
+    # Case cross-reference
+    if "open.pl" in href:
+        md_path = _href_to_md_link(href)
+        if md_path:
+            out += ("[", content, "](", md_path, ")")
+            return
+
+    # Legislation reference, other external links
+    if "nomoi" in href or "nomothesia" in href or href.startswith("http"):
+        out += ("[", content, "](", href, ")")
+        return
+
+    out.append(content)
 
-    if tag == "u":
-        # No native underline in Markdown, use emphasis
-        if content:
-            return f"*{content}*"
-        return ""
 
-    if tag == "sup":
-        return content
+def _bold(
+    content: str, el: etree._Element, depth: int, out: list[str]
+) -> None:
+    out += ("**", content, "**")
 
-    if tag == "sub":
-        return content
 
-    # Default: just return inner content
-    return content
+def _emphasis(
+    content: str, el: etree._Element, depth: int, out: list[str]
+) -> None:
+    # Also used for <u>: no native underline in Markdown
+    out += ("*", content, "*")
 
 
-def _convert_table(table: Tag, depth: int) -> str:
+def _heading(prefix: str):
+    def handler(
+        content: str, el: etree._Element, depth: int, out: list[str]
+    ) -> None:
+        out += ("\n\n", prefix, content, "\n\n")
+
+    return handler
+
+
+def _table(
+    content: str, el: etree._Element, depth: int, out: list[str]
+) -> None:
+    out.append(_convert_table(el, depth))
+
+
+_SKIP_TAGS = frozenset(("script", "style", "meta", "link", "img"))
+
+_HANDLERS = {
+    # Block-level elements
+    "h1": _heading("# "),
+    "h2": _heading("## "),
+    "h3": _heading("### "),
+    "h4": _heading("#### "),
+    "h5": _heading("#### "),
+    "h6": _heading("#### "),
+    "p": _block,
+    "div": _block,
+    "br": lambda content, el, depth, out: out.append("  \n"),
+    "hr": lambda content, el, depth, out: out.append("\n\n---\n\n"),
+    "blockquote": _blockquote,
+    "ul": _unordered_list,
+    "dir": _unordered_list,
+    "ol": _ordered_list,
+    # Tables — preserve as simple Markdown
+    "table": _table,
+    # Inline elements
+    "a": _anchor,
+    "b": _bold,
+    "strong": _bold,
+    "i": _emphasis,
+    "em": _emphasis,
+    "u": _emphasis,
+}
+
+
+def _convert_table(table: etree._Element, depth: int) -> str:
     """Convert an HTML table to Markdown table format."""
-    rows = table.find_all("tr")
+    rows = list(table.iter("tr"))
     if not rows:
         return ""
 
     md_rows: list[list[str]] = []
+    max_cols = 0
     for row in rows:
-        cells = row.find_all(["td", "th"])
         md_cells = []
-        for cell in cells:
-            cell_text = _convert_element(cell, depth + 1).strip()
-            cell_text = cell_text.replace("|", "\\|")
-            cell_text = re.sub(r"\s+", " ", cell_text)
-            md_cells.append(cell_text)
+        for cell in row.iter("td", "th"):
+            # Collapse all whitespace (split() also strips the ends)
+            cell_text = " ".join(_convert_to_str(cell, depth + 1).split())
+            md_cells.append(cell_text.translate(_PIPE_ESCAPE))
         if md_cells:
             md_rows.append(md_cells)
+            max_cols = max(max_cols, len(md_cells))
 
     if not md_rows:
         return ""
 
     # Normalize column count
-    max_cols = max(len(r) for r in md_rows)
     for row in md_rows:
         while len(row) < max_cols:
             row.append("")
@@ -351,20 +461,24 @@ def _convert_table(table: Tag, depth: int) -> str:
 def _normalize_markdown(md: str) -> str:
     """Clean up generated Markdown: fix excessive whitespace."""
     # Collapse multiple blank lines to max 2
-    md = re.sub(r"\n{3,}", "\n\n", md)
+    md = _MULTI_BLANK.sub("\n\n", md)
     # Remove trailing whitespace per line
-    lines = [line.rstrip() for line in md.split("\n")]
-    md = "\n".join(lines)
+    md = _TRAILING_WS.sub("", md)
     # Remove leading/trailing whitespace
     return md.strip() + "\n"
 
 
+def _count_words(md: str) -> int:
+    """Count words in Markdown text, ignoring Markdown syntax."""
+    return sum(1 for _ in _WORD_RE.finditer(md))
+
+
 def _count_refs(md: str) -> int:
     """Count case cross-references in Markdown text."""
-    return len(re.findall(r"\]\([^)]*\.md\)", md))
+    return len(_REF_RE.findall(md))
 
 
-def _strip_metadata_sections(html: str) -> str:
+def _strip_metadata_sections(html: bytes) -> bytes:
     """Remove ECLI metadata sections between sections_start and sections_end.
 
     These are HTML comments like:
@@ -375,22 +489,11 @@ def _strip_metadata_sections(html: str) -> str:
         <!--sections_end-->
 
     The content between these markers is technical metadata, not case text.
+    Also removes stray sino comments and the noteup markers (keeping the
+    content between them). One pass over the undecoded bytes: all markers
+    are ASCII, so this is safe for UTF-8 and the Greek 8-bit codepages.
     """
-    # Remove the sections block (ECLI metadata)
-    html = re.sub(
-        r"<!---?sections_start-?--?>.*?<!---?sections_end-?--?>",
-        "",
-        html,
-        flags=re.DOTALL,
-    )
-    # Remove any remaining sino comments
-    html = re.sub(r"<!--sino\s+[^>]+-->", "", html)
-    # Remove noteup markers (but keep the content between them)
-    html = html.replace("<!---noteup_start--->", "")
-    html = html.replace("<!---noteup_end--->", "")
-    html = html.replace("<!--noteup_start-->", "")
-    html = html.replace("<!--noteup_end-->", "")
-    return html
+    return _METADATA_RE.sub(b"", html)
 
 
 def extract_markdown_from_html(path: Path) -> str:
@@ -405,29 +508,15 @@ def extract_markdown_from_html(path: Path) -> str:
     Returns:
         Markdown string with preserved structure and links.
     """
-    raw = _read_html(path)
+    # Strip technical metadata before decoding and parsing
+    raw = _decode_html(_strip_metadata_sections(path.read_bytes()))
 
     # Handle server error artifacts
     if raw.startswith("Content-type:"):
         raw = raw.split("\n", 2)[-1]
 
-    # Strip technical metadata before parsing
-    raw = _strip_metadata_sections(raw)
-
-    soup = BeautifulSoup(raw, "html.parser")
-
-    # Remove script/style
-    for tag in soup(["script", "style"]):
-        tag.decompose()
-
-    # Extract title
-    title_tag = soup.find("title")
-    title = title_tag.get_text(strip=True) if title_tag else ""
-
-    # Convert body
-    body = soup.find("body")
-    if not body:
-        body = soup
+    title_match = _TITLE_RE.search(raw)
+    title = unescape(title_match.group(1)).strip() if title_match else ""
 
     md_parts: list[str] = []
 
@@ -435,16 +524,32 @@ def extract_markdown_from_html(path: Path) -> str:
     if title:
         md_parts.append(f"# {title}\n\n")
 
+    try:
+        root = lxml.html.document_fromstring(
+            raw.encode("utf-8"), parser=_HTML_PARSER
+        )
+    except etree.ParserError:
+        # Empty document
+        return _normalize_markdown("".join(md_parts))
+
+    # Convert body (a head-only document has nothing to convert)
+    body = root.find("body")
+    if body is None:
+        return _normalize_markdown("".join(md_parts))
+
+    def add_text(text: Optional[str]) -> None:
+        text = text.strip() if text else ""
+        if text and not _is_footer(text):
+            md_parts.append(text)
+
     # Convert body content
-    for child in body.children:
-        if isinstance(child, NavigableString):
-            text = str(child).strip()
-            if text and not _is_footer(text):
-                md_parts.append(text)
-        elif isinstance(child, Tag):
-            converted = _convert_element(child)
-            if converted:
-                md_parts.append(converted)
+    add_text(body.text)
+    for child in body:
+        if isinstance(child.tag, str):
+            _convert_element(child, md_parts)
+        else:
+            add_text(child.text)
+        add_text(child.tail)
 
     md = "".join(md_parts)
     return _normalize_markdown(md)
@@ -479,6 +584,10 @@ def extract_markdown_from_pdf(path: Path) -> str:
     return _normalize_markdown(md)
 
 
+# Output directories already created by this worker process
+_created_dirs: set[str] = set()
+
+
 def _process_single(args: tuple) -> tuple:
     """Process a single file (designed for multiprocessing).
 
@@ -498,13 +607,10 @@ def _process_single(args: tuple) -> tuple:
     court = _detect_court(rel_path)
     suffix = input_path.suffix.lower()
 
-    # Output path: same structure, .md extension
+    # Output path: same structure, .md extension.
+    # Already-processed files are filtered out by the parent.
     out_path = output_dir / rel_path.with_suffix(".md")
 
-    # Skip if already processed
-    if out_path.exists() and out_path.stat().st_size > 0:
-        return ("skip", court, "", 0, 0, 0, "")
-
     try:
         if suffix in (".htm", ".html", ""):
             md = extract_markdown_from_html(input_path)
@@ -518,14 +624,19 @@ def _process_single(args: tuple) -> tuple:
         if not md or len(md.strip()) < 10:
             return ("fail", court, "", 0, 0, 0, "Empty or too short")
 
-        # Strip Markdown syntax for word count
-        plain = re.sub(r"[#*_\[\]\(\)|>-]", " ", md)
-        word_count = len(plain.split())
+        word_count = _count_words(md)
         char_count = len(md)
         ref_count = _count_refs(md)
 
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(md, encoding="utf-8")
+        out_dir = str(out_path.parent)
+        if out_dir not in _created_dirs:
+            os.makedirs(out_dir, exist_ok=True)
+            _created_dirs.add(out_dir)
+        # Write-then-rename so an interrupted run never leaves a partial
+        # .md behind (it would be treated as done on the next run)
+        tmp_path = out_path.with_suffix(".md.tmp")
+        tmp_path.write_bytes(md.encode("utf-8"))
+        os.replace(tmp_path, out_path)
 
         return ("ok", court, fmt, word_count, char_count, ref_count, "")
 
@@ -533,26 +644,95 @@ def _process_single(args: tuple) -> tuple:
         return ("fail", court, "", 0, 0, 0, str(exc)[:200])
 
 
+def _process_batch(batch: list[tuple]) -> tuple[int, dict]:
+    """Process a batch of files and aggregate their stats in the worker.
+
+    Returns:
+        Tuple of (file_count, ExtractionStats.snapshot()).
+    """
+    stats = ExtractionStats()
+    for args in batch:
+        status, court, fmt, wc, cc, rc, err = _process_single(args)
+        if status == "ok":
+            stats.record_success(court, fmt, wc, cc, rc)
+        elif status == "skip":
+            stats.record_skip()
+        else:
+            stats.record_failure(court, err)
+    return len(batch), stats.snapshot()
+
+
+def _count_batch(batch: list[tuple]) -> tuple[int, dict]:
+    """Count words/refs in a batch of parsed .md files (--stats mode).
+
+    Args:
+        batch: List of (md_path_str, output_dir_str) tuples.
+
+    Returns:
+        Tuple of (file_count, ExtractionStats.snapshot()).
+    """
+    stats = ExtractionStats()
+    for md_path_str, output_dir_str in batch:
+        md_path = Path(md_path_str)
+        court = _detect_court(md_path.relative_to(output_dir_str))
+        text = md_path.read_text(encoding="utf-8")
+        stats.record_success(
+            court, "md", _count_words(text), len(text), _count_refs(text)
+        )
+    return len(batch), stats.snapshot()
+
+
+def _make_batches(items: list, workers: int) -> list[list]:
+    """Split work into batches for the worker pool.
+
+    Each batch produces one stats message instead of one per file;
+    ~8 batches per worker keeps the tail balanced when some files are
+    much slower than others.
+    """
+    size = max(1, min(128, len(items) // (workers * 8)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def existing_outputs(output_dir: Path) -> set[Path]:
+    """Relative paths of non-empty .md files already in the output dir."""
+    return {
+        f.relative_to(output_dir)
+        for f in output_dir.rglob("*.md")
+        if f.stat().st_size > 0
+    }
+
+
 def collect_files(
     input_dir: Path, court: Optional[str] = None
 ) -> list[Path]:
-    """Collect all processable files from the input directory."""
+    """Collect all processable files from the input directory.
+
+    Walks the tree with os.scandir: entries carry the file type from
+    readdir, so only files that pass the name filters are stat()ed.
+    """
     all_files: list[Path] = []
-    for f in input_dir.rglob("*"):
-        if not f.is_file():
-            continue
-        if f.name == ".DS_Store":
-            continue
-        suffix = f.suffix.lower()
-        if suffix in (".htm", ".html", ".pdf", ""):
-            if f.stat().st_size < 100:
-                continue
-            if court:
-                rel = f.relative_to(input_dir)
-                file_court = _detect_court(rel)
-                if file_court != court:
+    stack = [str(input_dir)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                if entry.name == ".DS_Store":
+                    continue
+                suffix = os.path.splitext(entry.name)[1].lower()
+                if suffix not in (".htm", ".html", ".pdf", ""):
                     continue
-            all_files.append(f)
+                if entry.stat(follow_symlinks=False).st_size < 100:
+                    continue
+                f = Path(entry.path)
+                if court:
+                    rel = f.relative_to(input_dir)
+                    if _detect_court(rel) != court:
+                        continue
+                all_files.append(f)
     return sorted(all_files)
 
 
@@ -663,14 +843,15 @@ def main() -> None:
         if not md_files:
             print("No parsed files found. Run extraction first.")
             sys.exit(0)
-        for f in tqdm(md_files, desc="Counting"):
-            rel = f.relative_to(output_dir)
-            court = _detect_court(rel)
-            text = f.read_text(encoding="utf-8")
-            plain = re.sub(r"[#*_\[\]\(\)|>-]", " ", text)
-            words = len(plain.split())
-            refs = _count_refs(text)
-            stats.record_success(court, "md", words, len(text), refs)
+        count_args = [(str(f), str(output_dir)) for f in md_files]
+        batches = _make_batches(count_args, args.workers)
+        with multiprocessing.Pool(processes=args.workers) as pool:
+            with tqdm(total=len(count_args), desc="Counting") as pbar:
+                for n_files, snapshot in pool.imap_unordered(
+                    _count_batch, batches
+                ):
+                    stats.merge(snapshot)
+                    pbar.update(n_files)
         print_stats(stats)
         return
 
@@ -685,6 +866,19 @@ def main() -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
     stats = ExtractionStats()
 
+    # Skip already-processed files here with one directory sweep, rather
+    # than a stat() and a task round trip per file in the workers
+    done = existing_outputs(output_dir)
+    todo = [
+        f for f in files
+        if f.relative_to(input_dir).with_suffix(".md") not in done
+    ]
+    stats.record_skip(len(files) - len(todo))
+    files = todo
+    logger.info(
+        "%d already extracted, %d to process.", stats.skipped, len(files)
+    )
+
     # Prepare arguments for multiprocessing
     work_args = [
         (str(f), str(input_dir), str(output_dir)) for f in files
@@ -693,19 +887,15 @@ def main() -> None:
     workers = args.workers
     logger.info("Using %d worker processes.", workers)
 
-    with ProcessPoolExecutor(max_workers=workers) as executor:
+    batches = _make_batches(work_args, workers)
+
+    with multiprocessing.Pool(processes=workers) as pool:
         with tqdm(total=len(work_args), desc="Extracting", unit="files") as pbar:
-            for result in executor.map(
-                _process_single, work_args, chunksize=64
+            for n_files, snapshot in pool.imap_unordered(
+                _process_batch, batches
             ):
-                status, court, fmt, wc, cc, rc, err = result
-                if status == "ok":
-                    stats.record_success(court, fmt, wc, cc, rc)
-                elif status == "skip":
-                    stats.record_skip()
-                else:
-                    stats.record_failure(court, err)
-                pbar.update(1)
+                stats.merge(snapshot)
+                pbar.update(n_files)
                 pbar.set_postfix(
                     ok=stats.processed,
                     skip=stats.skipped,
@@ -1,27 +1,65 @@
 """HTTP fetcher with rate limiting, disk caching, and retries.
 
 Wraps requests.Session to provide polite, reliable fetching of
-CyLaw index pages.
+CyLaw index pages. A single Fetcher may be shared between threads.
 """
 
 import hashlib
 import logging
 import os
+import random
+import threading
 import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import requests
 
 from scraper.config import (
+    HTTP_POOL_SIZE,
     REQUEST_DELAY,
     REQUEST_TIMEOUT,
     MAX_RETRIES,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_CAP,
     USER_AGENT,
 )
 
 logger = logging.getLogger(__name__)
 
+# Number of cached pages also kept in memory, in front of the disk cache
+MEMORY_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=4096)
+def _url_hash(url: str) -> str:
+    """Cache file stem for a URL (blake2b: filename only, not security)."""
+    return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+
+def _decode_body(response: requests.Response) -> str:
+    """Decode a response body — the site uses ISO-8859-7 / Windows-1253.
+
+    With no declared charset, requests' ``.text`` would run charset
+    detection over the whole body, which is slow on large index pages and
+    tends to guess mac_greek for Greek text. Try the site's encodings on
+    the bytes directly instead.
+    """
+    encoding = response.encoding
+    if encoding is None:
+        raw = response.content
+        try:
+            return raw.decode("utf-8")
+        except UnicodeDecodeError:
+            return raw.decode("iso-8859-7", errors="replace")
+    if encoding.lower() in ("iso-8859-1", "latin-1"):
+        # requests defaults to ISO-8859-1 for text/html without
+        # explicit charset; try Greek encoding instead
+        response.encoding = "iso-8859-7"
+    return response.text
+
 
 class Fetcher:
     """HTTP client with rate limiting, disk caching, and retry logic.
@@ -32,6 +70,9 @@ class Fetcher:
         delay: Seconds to wait between HTTP requests.
         max_retries: Maximum number of retry attempts on server errors.
         timeout: HTTP request timeout in seconds.
+        backoff_base: Upper bound of the first retry wait, in seconds;
+            doubles with each further attempt.
+        backoff_cap: Largest upper bound for a retry wait, in seconds.
     """
 
     def __init__(
@@ -40,14 +81,31 @@ class Fetcher:
         delay: float = REQUEST_DELAY,
         max_retries: int = MAX_RETRIES,
         timeout: int = REQUEST_TIMEOUT,
+        backoff_base: float = RETRY_BACKOFF_BASE,
+        backoff_cap: float = RETRY_BACKOFF_CAP,
     ):
         self._session = requests.Session()
         self._session.headers.update({"User-Agent": USER_AGENT})
+        # Keep-alive pool shared by every thread using this fetcher, so
+        # year/court workers reuse TLS connections instead of handshaking
+        # per request. Retries stay in fetch() (no urllib3 Retry on top).
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=0,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         self._cache_dir = cache_dir
         self._delay = delay
         self._max_retries = max_retries
         self._timeout = timeout
+        self._backoff_base = backoff_base
+        self._backoff_cap = backoff_cap
         self._last_request_time: float = 0.0
+        # Guards the rate-limit clock and the in-memory LRU across threads
+        self._lock = threading.Lock()
+        self._memory_cache: OrderedDict[str, str] = OrderedDict()
 
         if self._cache_dir:
             os.makedirs(self._cache_dir, exist_ok=True)
@@ -56,37 +114,90 @@ class Fetcher:
         """Return cache file path for a given URL, or None if caching disabled."""
         if not self._cache_dir:
             return None
-        url_hash = hashlib.md5(url.encode()).hexdigest()
-        return Path(self._cache_dir) / f"{url_hash}.html"
+        return Path(self._cache_dir) / f"{_url_hash(url)}.html"
+
+    def _remember(self, url: str, content: str) -> None:
+        """Add a page to the in-memory LRU, evicting the oldest entry."""
+        with self._lock:
+            self._memory_cache[url] = content
+            self._memory_cache.move_to_end(url)
+            if len(self._memory_cache) > MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
 
     def _read_cache(self, url: str) -> Optional[str]:
         """Read cached response for URL, or None if not cached."""
+        with self._lock:
+            content = self._memory_cache.get(url)
+            if content is not None:
+                self._memory_cache.move_to_end(url)
+        if content is not None:
+            logger.debug("Memory cache hit: %s", url)
+            return content
         path = self._cache_path(url)
         if path and path.exists():
             logger.debug("Cache hit: %s", url)
-            return path.read_text(encoding="utf-8", errors="replace")
+            content = path.read_text(encoding="utf-8", errors="replace")
+            self._remember(url, content)
+            return content
         return None
 
     def _write_cache(self, url: str, content: str) -> None:
         """Write response content to cache."""
         path = self._cache_path(url)
         if path:
-            path.write_text(content, encoding="utf-8")
+            # Write-then-rename so concurrent readers never see a partial page
+            tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            try:
+                tmp.write_text(content, encoding="utf-8")
+                os.replace(tmp, path)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            self._remember(url, content)
             logger.debug("Cached: %s", url)
 
     def _rate_limit(self) -> None:
-        """Wait if needed to respect the rate limit."""
+        """Wait if needed to respect the rate limit.
+
+        Each caller reserves the next free request slot under the lock,
+        so concurrent threads are spaced ``delay`` apart rather than
+        all firing once the previous request's delay has elapsed.
+        """
         if self._delay <= 0:
             return
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self._delay and self._last_request_time > 0:
-            time.sleep(self._delay)
+        with self._lock:
+            now = time.monotonic()
+            if self._last_request_time <= 0:
+                self._last_request_time = now
+                return
+            slot = max(now, self._last_request_time + self._delay)
+            self._last_request_time = slot
+        remaining = slot - now
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _mark_request(self) -> None:
+        """Record that a request is being sent now."""
+        with self._lock:
+            self._last_request_time = max(
+                self._last_request_time, time.monotonic()
+            )
+
+    def _backoff(self, attempt: int) -> None:
+        """Sleep before retrying after failed attempt number ``attempt``.
+
+        Full jitter: a uniform wait between 0 and the exponential bound,
+        so threads that failed together don't retry in lockstep.
+        """
+        bound = min(self._backoff_base * 2 ** (attempt - 1), self._backoff_cap)
+        time.sleep(random.uniform(0, bound))
 
     def fetch(self, url: str) -> str:
         """Fetch a URL, using cache if available.
 
-        Implements rate limiting, disk caching, retry with exponential
-        backoff on 5xx errors, and proper encoding handling for Greek text.
+        Implements rate limiting, disk caching, retry with jittered
+        exponential backoff on 5xx errors, and proper encoding handling
+        for Greek text.
 
         Args:
             url: The URL to fetch.
@@ -108,7 +219,7 @@ class Fetcher:
         last_error: Optional[Exception] = None
         for attempt in range(1, self._max_retries + 1):
             try:
-                self._last_request_time = time.time()
+                self._mark_request()
                 response = self._session.get(url, timeout=self._timeout)
 
                 if response.status_code >= 500:
@@ -120,20 +231,10 @@ class Fetcher:
                         self._max_retries,
                     )
                     if attempt < self._max_retries:
-                        backoff = 2 ** (attempt - 1)
-                        time.sleep(backoff)
+                        self._backoff(attempt)
                     continue
 
-                # Handle encoding — the site uses ISO-8859-7 / Windows-1253
-                if response.encoding and response.encoding.lower() in (
-                    "iso-8859-1",
-                    "latin-1",
-                ):
-                    # requests defaults to ISO-8859-1 for text/html without
-                    # explicit charset; try Greek encoding instead
-                    response.encoding = "iso-8859-7"
-
-                content = response.text
+                content = _decode_body(response)
                 self._write_cache(url, content)
                 return content
 
@@ -147,8 +248,7 @@ class Fetcher:
                     exc,
                 )
                 if attempt < self._max_retries:
-                    backoff = 2 ** (attempt - 1)
-                    time.sleep(backoff)
+                    self._backoff(attempt)
 
         raise RuntimeError(
             f"Failed to fetch {url} after {self._max_retries} attempts. "
@@ -7,14 +7,15 @@ Extracts case links from three page formats:
 """
 
 import re
-from dataclasses import dataclass, asdict
+import sys
+from dataclasses import dataclass
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from scraper.config import BASE_URL
 
 
-@dataclass
+@dataclass(slots=True)
 class CaseEntry:
     """A single court case extracted from an index page."""
 
@@ -26,8 +27,26 @@ class CaseEntry:
     date: str = ""
 
     def to_dict(self) -> dict:
-        return asdict(self)
-
+        # Explicit literal: asdict() recurses and deep-copies every field.
+        return {
+            "url": self.url,
+            "file_path": self.file_path,
+            "title": self.title,
+            "court": self.court,
+            "year": self.year,
+            "date": self.date,
+        }
+
+
+# Filters case links and captures their file= parameter in one scan
+_OPEN_PL_FILE_RE = re.compile(r"open\.pl\?[^\"']*?file=([^\s&\"']+)")
+_YEAR_RE = re.compile(r"/(\d{4})/")
+# Year-index links on a court's main page:
+#   index_2026.html          — standard year index
+#   index_pol_2005.html      — apofaseised category+year index
+#   index_1.html             — rscc volume index
+#   2025/index.html          — epa/aap year subdirectory
+_INDEX_RE = re.compile(r"index_\w*\d+\.html|/\d{4}/index\.html")
 
 # Maps file_path prefixes to court IDs for the updates parser.
 _PATH_TO_COURT = {
@@ -48,38 +67,107 @@ _PATH_TO_COURT = {
     "/juvenileCourt/": "juvenileCourt",
 }
 
+# One anchored alternation over all prefixes, longest first so a more
+# specific prefix always wins over a shorter one it starts with.
+_COURT_PREFIX_RE = re.compile(
+    "^("
+    + "|".join(
+        re.escape(p) for p in sorted(_PATH_TO_COURT, key=len, reverse=True)
+    )
+    + ")"
+)
+
+
+class _AnchorCollector:
+    """lxml parser target that records (href, text) for each <a href>.
+
+    Receives SAX-style events, so no element tree is ever built for
+    the (mostly table and script) content around the links.
+    """
+
+    def __init__(self) -> None:
+        self.anchors: list[tuple[str, str]] = []
+        self._open: list[tuple[str, list[str]]] = []
+        self._run: list[str] = []
+
+    def _flush(self) -> None:
+        # A text node may arrive as several data() calls; strip it whole.
+        if self._run:
+            text = "".join(self._run).strip()
+            self._run.clear()
+            if text:
+                for _, parts in self._open:
+                    parts.append(text)
+
+    def start(self, tag, attrib) -> None:
+        self._flush()
+        if tag == "a":
+            # Anchors without href still have to be balanced against end().
+            self._open.append((attrib.get("href"), []))
+
+    def data(self, data) -> None:
+        if self._open:
+            self._run.append(data)
+
+    def comment(self, text) -> None:
+        self._flush()
+
+    def end(self, tag) -> None:
+        self._flush()
+        if tag == "a" and self._open:
+            href, parts = self._open.pop()
+            if href is not None:
+                self.anchors.append((href, "".join(parts)))
+
+    def close(self) -> list[tuple[str, str]]:
+        return self.anchors
+
+
+def _iter_anchors(html: str) -> list[tuple[str, str]]:
+    """Return (href, text) for every <a href> in the page.
+
+    Text matches BeautifulSoup's ``get_text(strip=True)``: each text
+    node is stripped and the pieces are joined without separators.
+    """
+    collector = _AnchorCollector()
+    # Parsers holding a target are stateful, so one is built per page.
+    parser = etree.HTMLParser(target=collector, encoding="utf-8")
+    # Encode so lxml accepts pages that carry an XML encoding declaration.
+    parser.feed(html.encode("utf-8"))
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:  # empty or comment-only page
+        pass
+    return collector.anchors
+
 
 def _detect_court(file_path: str) -> str:
     """Detect court ID from a file path."""
-    for prefix, court_id in _PATH_TO_COURT.items():
-        if file_path.startswith(prefix):
-            return court_id
+    m = _COURT_PREFIX_RE.match(file_path)
+    if m:
+        return _PATH_TO_COURT[m.group(1)]
     return "unknown"
 
 
 def _detect_year(file_path: str) -> str:
     """Extract year from a file path like /courtOfAppeal/2026/..."""
-    m = re.search(r"/(\d{4})/", file_path)
+    m = _YEAR_RE.search(file_path)
     if m:
         return m.group(1)
     return ""
 
 
 def _extract_file_path(href: str) -> str:
-    """Extract the file= parameter from an open.pl URL."""
-    m = re.search(r"file=([^\s&\"']+)", href)
+    """Extract the file= parameter from an open.pl URL.
+
+    Returns an empty string for hrefs that are not open.pl case links.
+    """
+    m = _OPEN_PL_FILE_RE.search(href)
     if m:
         return m.group(1)
     return ""
 
 
-def _make_absolute_url(href: str) -> str:
-    """Convert a relative href to an absolute URL."""
-    if href.startswith("http"):
-        return href
-    return BASE_URL + href
-
-
 def parse_court_main_index(html: str, court_id: str) -> list[str]:
     """Parse a court's main index page and return year-index URLs.
 
@@ -90,23 +178,13 @@ def parse_court_main_index(html: str, court_id: str) -> list[str]:
     Returns:
         List of relative URLs to year-specific index pages.
     """
-    soup = BeautifulSoup(html, "html.parser")
     urls: list[str] = []
     seen: set[str] = set()
 
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        # Match patterns:
-        #   index_2026.html          — standard year index
-        #   index_pol_2005.html      — apofaseised category+year index
-        #   index_1.html             — rscc volume index
-        #   2025/index.html          — epa/aap year subdirectory
-        if re.search(r"index_\w*\d+\.html", href) or re.search(
-            r"/\d{4}/index\.html", href
-        ):
-            if href not in seen:
-                seen.add(href)
-                urls.append(href)
+    for href, _ in _iter_anchors(html):
+        if _INDEX_RE.search(href) and href not in seen:
+            seen.add(href)
+            urls.append(href)
 
     return urls
 
@@ -124,15 +202,11 @@ def parse_year_index(
     Returns:
         List of CaseEntry objects, one per case link found.
     """
-    soup = BeautifulSoup(html, "html.parser")
     entries: list[CaseEntry] = []
     seen_paths: set[str] = set()
+    base_url = BASE_URL
 
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if "open.pl" not in href:
-            continue
-
+    for href, title in _iter_anchors(html):
         file_path = _extract_file_path(href)
         if not file_path:
             continue
@@ -141,8 +215,8 @@ def parse_year_index(
             continue
         seen_paths.add(file_path)
 
-        title = a.get_text(strip=True)
-        url = _make_absolute_url(href)
+        # Relative hrefs are made absolute inline (hot per-anchor path)
+        url = href if href.startswith("http") else base_url + href
 
         entries.append(
             CaseEntry(
@@ -169,15 +243,11 @@ def parse_updates_page(html: str) -> list[CaseEntry]:
     Returns:
         List of CaseEntry objects from all courts.
     """
-    soup = BeautifulSoup(html, "html.parser")
     entries: list[CaseEntry] = []
     seen_paths: set[str] = set()
+    base_url = BASE_URL
 
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if "open.pl" not in href:
-            continue
-
+    for href, title in _iter_anchors(html):
         file_path = _extract_file_path(href)
         if not file_path:
             continue
@@ -186,10 +256,12 @@ def parse_updates_page(html: str) -> list[CaseEntry]:
             continue
         seen_paths.add(file_path)
 
-        title = a.get_text(strip=True)
-        url = _make_absolute_url(href)
+        # Relative hrefs are made absolute inline (hot per-anchor path)
+        url = href if href.startswith("http") else base_url + href
         court = _detect_court(file_path)
-        year = _detect_year(file_path)
+        # Each regex match is a fresh string; intern so all entries of a
+        # year share one object (courts already come from _PATH_TO_COURT)
+        year = sys.intern(_detect_year(file_path))
 
         entries.append(
             CaseEntry(
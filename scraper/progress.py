@@ -0,0 +1,59 @@
+"""SQLite-backed resume tracking for long-running bulk jobs.
+
+Stores completed keys in a single-table database in WAL mode, so a
+resume check or a completion record costs one indexed statement instead
+of re-reading or rewriting a text/JSON progress file.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class ProgressDB:
+    """Thread-safe set of completed keys persisted to SQLite.
+
+    One connection is shared by all threads and guarded by a lock;
+    WAL mode keeps readers from blocking the writer on disk.
+    """
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self._conn.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "CREATE TABLE IF NOT EXISTS done(key TEXT PRIMARY KEY);"
+        )
+
+    def is_done(self, key: str) -> bool:
+        """Check if a key has already been recorded."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM done WHERE key = ? LIMIT 1", (key,)
+            ).fetchone()
+        return row is not None
+
+    def mark_done(self, key: str) -> None:
+        """Record a key as completed (idempotent)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO done VALUES (?)", (key,)
+            )
+
+    def load_all(self) -> set[str]:
+        """Return every recorded key."""
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT key FROM done")}
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM done").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -9,10 +9,13 @@ Usage:
 """
 
 import argparse
-import json
 import logging
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
 from tqdm import tqdm
 
@@ -20,7 +23,9 @@ from scraper.config import (
     COURTS,
     UPDATES_URL,
     CACHE_DIR,
+    COURT_WORKERS,
     INDEX_DIR,
+    SCRAPE_WORKERS,
     get_court,
 )
 from scraper.fetcher import Fetcher
@@ -30,26 +35,45 @@ from scraper.parser import (
     parse_year_index,
     parse_updates_page,
 )
-from scraper.storage import save_court_index, save_updates_index, load_court_index
+from scraper.storage import (
+    save_court_index,
+    save_updates_index,
+    load_court_index,
+    load_index_meta,
+)
 
 logger = logging.getLogger(__name__)
 
 # Project root is one level up from scraper/
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
+_YEAR4_RE = re.compile(r"(\d{4})")
+_VOL_RE = re.compile(r"index_(\d+)\.html")
+
 
 def _resolve_dir(relative_path: str) -> str:
     """Resolve a path relative to the project root."""
     return str(PROJECT_ROOT / relative_path)
 
 
-def scrape_court(court_id: str, fetcher: Fetcher, output_dir: str) -> int:
+def scrape_court(
+    court_id: str,
+    fetcher: Fetcher,
+    output_dir: str,
+    workers: int = SCRAPE_WORKERS,
+    scraped_at: Optional[str] = None,
+) -> int:
     """Scrape all year indexes for a single court.
 
+    Year pages are fetched and parsed on a thread pool; the shared
+    fetcher still spaces the actual requests by its configured delay.
+
     Args:
         court_id: Court identifier from the registry.
         fetcher: Configured Fetcher instance.
         output_dir: Directory for JSON output.
+        workers: Number of year pages fetched concurrently.
+        scraped_at: ISO timestamp shared by all indexes of this run.
 
     Returns:
         Total number of case entries found.
@@ -78,9 +102,7 @@ def scrape_court(court_id: str, fetcher: Fetcher, output_dir: str) -> int:
             year_urls.append(relative)
 
     # Step 2: Fetch each year page and extract cases
-    all_entries: list[CaseEntry] = []
-    desc = f"  {court_id} years"
-    for year_url in tqdm(year_urls, desc=desc, leave=False):
+    def _scrape_year(year_url: str) -> list[CaseEntry]:
         # Make URL absolute
         if year_url.startswith("/"):
             full_url = f"https://www.cylaw.org{year_url}"
@@ -92,16 +114,25 @@ def scrape_court(court_id: str, fetcher: Fetcher, output_dir: str) -> int:
 
         try:
             html = fetcher.fetch(full_url)
-            entries = parse_year_index(html, court_id, year)
-            all_entries.extend(entries)
-            logger.info(
-                "  %s year %s: %d cases", court_id, year, len(entries)
-            )
         except RuntimeError as exc:
             logger.error("  Failed to fetch %s: %s", full_url, exc)
+            return []
+        entries = parse_year_index(html, court_id, year)
+        logger.info("  %s year %s: %d cases", court_id, year, len(entries))
+        return entries
+
+    all_entries: list[CaseEntry] = []
+    desc = f"  {court_id} years"
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        # map() preserves year order, so the saved index is deterministic
+        results = pool.map(_scrape_year, year_urls)
+        for entries in tqdm(
+            results, total=len(year_urls), desc=desc, leave=False
+        ):
+            all_entries.extend(entries)
 
     # Step 3: Save
-    save_court_index(court_id, all_entries, output_dir)
+    save_court_index(court_id, all_entries, output_dir, scraped_at)
     logger.info(
         "Court %s: %d total cases saved.", court_id, len(all_entries)
     )
@@ -117,24 +148,27 @@ def _extract_year_from_url(url: str) -> str:
         2025/index.html         → "2025"
         index_1.html            → "vol_1"  (RSCC volumes)
     """
-    import re
-
-    m = re.search(r"(\d{4})", url)
+    m = _YEAR4_RE.search(url)
     if m:
         return m.group(1)
     # Fallback: extract short number for volume-based indexes (RSCC)
-    m = re.search(r"index_(\d+)\.html", url)
+    m = _VOL_RE.search(url)
     if m:
         return f"vol_{m.group(1)}"
     return "unknown"
 
 
-def scrape_updates(fetcher: Fetcher, output_dir: str) -> int:
+def scrape_updates(
+    fetcher: Fetcher,
+    output_dir: str,
+    scraped_at: Optional[str] = None,
+) -> int:
     """Scrape the updates.html page.
 
     Args:
         fetcher: Configured Fetcher instance.
         output_dir: Directory for JSON output.
+        scraped_at: ISO timestamp of this run (default: now).
 
     Returns:
         Total number of case entries found.
@@ -142,7 +176,7 @@ def scrape_updates(fetcher: Fetcher, output_dir: str) -> int:
     logger.info("Scraping updates page...")
     html = fetcher.fetch(UPDATES_URL)
     entries = parse_updates_page(html)
-    save_updates_index(entries, output_dir)
+    save_updates_index(entries, output_dir, scraped_at)
     logger.info("Updates: %d total cases saved.", len(entries))
     return len(entries)
 
@@ -163,11 +197,10 @@ def print_stats(output_dir: str) -> None:
     print("-" * 60)
 
     for json_file in sorted(output_path.glob("*.json")):
-        data = json.loads(json_file.read_text(encoding="utf-8"))
+        data = load_index_meta(json_file)
         court = data.get("court", data.get("source", json_file.stem))
         total = data.get("total", 0)
-        by_year = data.get("by_year", {})
-        years = sorted(by_year.keys())
+        years = sorted(data["years"])
         year_range = f"{years[0]}–{years[-1]}" if years else "—"
         print(f"{court:<25} {total:>8}  {year_range}")
         total_all += total
@@ -216,6 +249,18 @@ def main() -> None:
         default=None,
         help=f"Output directory for JSON indexes (default: {INDEX_DIR})",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SCRAPE_WORKERS,
+        help=f"Year pages fetched concurrently per court (default: {SCRAPE_WORKERS})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=COURT_WORKERS,
+        help=f"Courts scraped in parallel with --all (default: {COURT_WORKERS})",
+    )
     parser.add_argument(
         "--no-cache",
         action="store_true",
@@ -249,10 +294,18 @@ def main() -> None:
         return
 
     fetcher = Fetcher(cache_dir=cache_dir if not args.no_cache else None)
+    # One timestamp for the whole run, stamped into every saved index
+    scraped_at = datetime.now(timezone.utc).isoformat()
 
     if args.court:
         try:
-            count = scrape_court(args.court, fetcher, output_dir)
+            count = scrape_court(
+                args.court,
+                fetcher,
+                output_dir,
+                workers=args.workers,
+                scraped_at=scraped_at,
+            )
             print(f"\nDone: {count} cases found for court '{args.court}'.")
         except ValueError as exc:
             print(f"Error: {exc}", file=sys.stderr)
@@ -260,13 +313,28 @@ def main() -> None:
 
     elif args.all:
         grand_total = 0
-        for court in tqdm(COURTS, desc="Courts"):
-            count = scrape_court(court.court_id, fetcher, output_dir)
-            grand_total += count
+        # Threads, not processes: all courts share the fetcher, so its
+        # rate limit still applies to the site as a whole.
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            futures = [
+                pool.submit(
+                    scrape_court,
+                    court.court_id,
+                    fetcher,
+                    output_dir,
+                    args.workers,
+                    scraped_at,
+                )
+                for court in COURTS
+            ]
+            for future in tqdm(
+                as_completed(futures), total=len(futures), desc="Courts"
+            ):
+                grand_total += future.result()
         print(f"\nDone: {grand_total} total cases across all courts.")
 
     elif args.updates:
-        count = scrape_updates(fetcher, output_dir)
+        count = scrape_updates(fetcher, output_dir, scraped_at)
         print(f"\nDone: {count} cases from updates page.")
 
 
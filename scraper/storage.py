@@ -6,36 +6,103 @@ Produces JSON files organized by court with cases grouped by year.
 import json
 import logging
 import os
-from collections import defaultdict
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
 from scraper.parser import CaseEntry
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Summary sidecars live in a subdirectory so "*.json" globs over the
+# index dir (downloader, print_stats) only ever see full indexes.
+META_SUBDIR = "meta"
+
+# Output directories already created in this process
+_created_dirs: set[str] = set()
+
+
+def _dump_json(data: dict) -> bytes:
+    """Serialize an index dict as indented UTF-8 JSON bytes.
+
+    orjson emits bytes directly (no intermediate str copy) and is several
+    times faster on large court indexes; output matches the stdlib
+    ``json.dumps(..., ensure_ascii=False, indent=2)`` form.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _load_json(raw: bytes) -> dict:
+    """Parse UTF-8 JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _ensure_dir(output_dir: str) -> None:
+    """Create output_dir once per process."""
+    if output_dir not in _created_dirs:
+        os.makedirs(output_dir, exist_ok=True)
+        _created_dirs.add(output_dir)
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    """Write bytes via a temp file and rename.
+
+    Readers (e.g. print_stats during a scrape) never see a half-written
+    index, and an interrupted run leaves the previous file intact.
+    """
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def _save_index(output_path: Path, data: dict) -> None:
+    """Write a full index plus its small summary sidecar."""
+    _atomic_write(output_path, _dump_json(data))
+    meta = {k: v for k, v in data.items() if k != "by_year"}
+    meta["years"] = list(data["by_year"])
+    meta_dir = output_path.parent / META_SUBDIR
+    _ensure_dir(str(meta_dir))
+    _atomic_write(meta_dir / output_path.name, _dump_json(meta))
+
 
 def _group_by_year(
     entries: list[CaseEntry],
 ) -> dict[str, list[dict]]:
     """Group case entries by year, converting each to a dict."""
-    by_year: dict[str, list[dict]] = defaultdict(list)
+    # Create the year keys in final order (descending, for readability)
+    # so the result needs no re-sort or dict rebuild afterwards.
+    years = sorted({entry.year or "unknown" for entry in entries}, reverse=True)
+    by_year: dict[str, list[dict]] = {year: [] for year in years}
     for entry in entries:
-        year_key = entry.year if entry.year else "unknown"
-        by_year[year_key].append(entry.to_dict())
-    # Sort years descending for readability
-    return dict(sorted(by_year.items(), reverse=True))
+        by_year[entry.year or "unknown"].append(entry.to_dict())
+    return by_year
 
 
 def save_court_index(
     court_id: str,
     entries: list[CaseEntry],
     output_dir: str,
+    scraped_at: Optional[str] = None,
 ) -> Path:
     """Save a court's case index as a JSON file.
 
-    Creates a file at {output_dir}/{court_id}.json with structure:
+    Creates a file at {output_dir}/{court_id}.json (plus a summary
+    without the case lists in {output_dir}/meta/) with structure:
     {
         "court": "courtOfAppeal",
         "scraped_at": "2026-02-06T...",
@@ -47,24 +114,22 @@ def save_court_index(
         court_id: The court identifier.
         entries: List of CaseEntry objects to save.
         output_dir: Directory where the JSON file will be created.
+        scraped_at: ISO timestamp of the scrape run (default: now).
 
     Returns:
         Path to the created JSON file.
     """
-    os.makedirs(output_dir, exist_ok=True)
+    _ensure_dir(output_dir)
     output_path = Path(output_dir) / f"{court_id}.json"
 
     data = {
         "court": court_id,
-        "scraped_at": datetime.now(timezone.utc).isoformat(),
+        "scraped_at": scraped_at or _now_iso(),
         "total": len(entries),
         "by_year": _group_by_year(entries),
     }
 
-    output_path.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    _save_index(output_path, data)
     logger.info(
         "Saved %d entries for court '%s' to %s",
         len(entries),
@@ -77,30 +142,29 @@ def save_court_index(
 def save_updates_index(
     entries: list[CaseEntry],
     output_dir: str,
+    scraped_at: Optional[str] = None,
 ) -> Path:
     """Save the cross-court updates index as a JSON file.
 
     Args:
         entries: List of CaseEntry objects from the updates page.
         output_dir: Directory where updates.json will be created.
+        scraped_at: ISO timestamp of the scrape run (default: now).
 
     Returns:
         Path to the created JSON file.
     """
-    os.makedirs(output_dir, exist_ok=True)
+    _ensure_dir(output_dir)
     output_path = Path(output_dir) / "updates.json"
 
     data = {
         "source": "updates.html",
-        "scraped_at": datetime.now(timezone.utc).isoformat(),
+        "scraped_at": scraped_at or _now_iso(),
         "total": len(entries),
         "by_year": _group_by_year(entries),
     }
 
-    output_path.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    _save_index(output_path, data)
     logger.info("Saved %d update entries to %s", len(entries), output_path)
     return output_path
 
@@ -121,4 +185,28 @@ def load_court_index(
     path = Path(output_dir) / f"{court_id}.json"
     if not path.exists():
         return None
-    return json.loads(path.read_text(encoding="utf-8"))
+    return _load_json(path.read_bytes())
+
+
+def load_index_meta(json_path: Path) -> dict:
+    """Load the summary of a saved index without reading its case lists.
+
+    Uses the meta/ sidecar when it is at least as new as the index;
+    otherwise (indexes saved before sidecars existed) falls back to
+    loading the full file.
+
+    Args:
+        json_path: Path to a full index JSON file.
+
+    Returns:
+        Dict with the top-level index fields and a "years" list.
+    """
+    meta_path = json_path.parent / META_SUBDIR / json_path.name
+    try:
+        if meta_path.stat().st_mtime >= json_path.stat().st_mtime:
+            return _load_json(meta_path.read_bytes())
+    except FileNotFoundError:
+        pass
+    data = _load_json(json_path.read_bytes())
+    data["years"] = list(data.pop("by_year", {}))
+    return data
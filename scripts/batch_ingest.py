@@ -23,35 +23,46 @@ Usage:
     python scripts/batch_ingest.py prepare --limit 1000   # test with subset
     python scripts/batch_ingest.py prepare --court aad    # one court only
     python scripts/batch_ingest.py upload --index other   # upload to different index
+    python scripts/batch_ingest.py collect --round-floats 6  # ~30% smaller uploads
 
 Environment:
     OPENAI_API_KEY, CLOUDFLARE_ACCOUNT_ID, CLOUDFLARE_API_TOKEN
 """
 
 import argparse
+import collections
 import concurrent.futures
+import gzip
 import hashlib
 import json
 import logging
 import multiprocessing
 import os
+import re
 import sys
 import threading
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import requests as http_requests
 from dotenv import load_dotenv
 from openai import OpenAI
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
 load_dotenv()
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from rag.chunker import chunk_document, _detect_court, _detect_court_level, _detect_subcourt
+from rag.ratelimit import AdaptiveLimiter, retry_after_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +79,8 @@ BATCH_DIR = PROJECT_ROOT / "data" / "batch_embed"
 EMBEDDINGS_DIR = BATCH_DIR / "embeddings"  # cached OpenAI batch results
 STATE_FILE = BATCH_DIR / "state.json"
 META_FILE = BATCH_DIR / "chunks_meta.jsonl"
+META_SLIM_FILE = BATCH_DIR / "chunks_meta.slim.jsonl"  # META_FILE minus chunk text
+DUPS_FILE = BATCH_DIR / "chunks_dups.jsonl"  # chunks whose text was already embedded
 
 # Batch API limits
 INPUTS_PER_REQUEST = 100   # embedding inputs per API request line
@@ -75,20 +88,70 @@ INPUTS_PER_BATCH = 50_000  # max embedding inputs per batch (OpenAI limit)
 REQUESTS_PER_BATCH = INPUTS_PER_BATCH // INPUTS_PER_REQUEST  # 500
 
 # Vectorize upload
-UPLOAD_BATCH = 5000
+UPLOAD_BATCH = 5000    # Vectorize max vectors per insert
+# Flush a request early once its NDJSON body would exceed this size
+# (Cloudflare caps API bodies at 100 MB). Set with --max-body-mb.
+UPLOAD_MAX_BODY_BYTES = 90 * 1024 * 1024
 UPLOAD_WORKERS = 6     # parallel uploads to Vectorize
+UPLOAD_MAX_RPS = 4.0   # Cloudflare API: 1200 requests / 5 min
+SUBMIT_WORKERS = 8     # parallel batch file uploads to OpenAI
 MAX_VECTOR_ID_BYTES = 64
+# Decimal places kept per vector component on upload (None = as returned
+# by OpenAI). 6 places cuts NDJSON ~30% for a ~1e-10 cosine drift, at
+# roughly 1 ms of CPU per 3072-d vector. Set with --round-floats.
+UPLOAD_FLOAT_DECIMALS: Optional[int] = None
+UPLOAD_GZIP_LEVEL = 1  # level 1: most of the ratio on float text, far cheaper than 6
+
+# One keep-alive session for every Cloudflare API call, so uploads reuse
+# pooled TLS connections instead of handshaking per NDJSON chunk.
+_CF_SESSION = http_requests.Session()
+_CF_SESSION.mount(
+    "https://",
+    http_requests.adapters.HTTPAdapter(
+        pool_connections=UPLOAD_WORKERS,
+        pool_maxsize=UPLOAD_WORKERS * 2,
+        max_retries=0,
+    ),
+)
 
 
 # ── Helpers ─────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=100_000)
+def _short_doc_id(doc_id: str) -> str:
+    """Hashed stand-in for doc IDs too long for a vector ID.
+
+    Stays MD5 so IDs match vectors already in the index (upserts must
+    overwrite, not duplicate). Cached: consecutive chunks share a doc.
+    """
+    return hashlib.md5(doc_id.encode("utf-8")).hexdigest()[:16]
+
+
 def make_vector_id(doc_id: str, chunk_index: int) -> str:
     """Create a Vectorize-safe vector ID (max 64 bytes)."""
     readable = f"{doc_id}::{chunk_index}"
-    if len(readable.encode("utf-8")) <= MAX_VECTOR_ID_BYTES:
+    # ASCII IDs (the common case) are one byte per char: skip the encode
+    if readable.isascii():
+        fits = len(readable) <= MAX_VECTOR_ID_BYTES
+    else:
+        fits = len(readable.encode("utf-8")) <= MAX_VECTOR_ID_BYTES
+    if fits:
         return readable
-    short = hashlib.md5(doc_id.encode("utf-8")).hexdigest()[:16]
-    return f"{short}::{chunk_index}"
+    return f"{_short_doc_id(doc_id)}::{chunk_index}"
+
+
+def _dumps(obj) -> bytes:
+    """Compact UTF-8 JSON for NDJSON/JSONL lines (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data):
+    """Parse one JSON document from str or bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def load_state() -> dict:
@@ -97,9 +160,95 @@ def load_state() -> dict:
     return {"phase": "init", "batches": []}
 
 
+_state_lock = threading.Lock()
+
+
 def save_state(state: dict) -> None:
-    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    STATE_FILE.write_text(json.dumps(state, indent=2, ensure_ascii=False))
+    """Write state.json atomically (tmp file + rename), one writer at a time.
+
+    An interrupted write leaves the previous state intact instead of a
+    truncated file that would lose track of submitted batches.
+    """
+    data = json.dumps(state, indent=2, ensure_ascii=False)
+    with _state_lock:
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = STATE_FILE.with_suffix(".tmp")
+        tmp.write_text(data)
+        os.replace(tmp, STATE_FILE)
+
+
+# Low-cardinality metadata fields: interned so the millions of rows in a
+# loaded metadata index share one string object per distinct value.
+_INTERNED_META_FIELDS = ("court", "year", "court_level", "subcourt", "jurisdiction")
+
+
+def _slim_meta_is_fresh() -> bool:
+    """True if META_SLIM_FILE exists and is not older than META_FILE."""
+    try:
+        return META_SLIM_FILE.stat().st_mtime >= META_FILE.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+
+def load_meta_index(include_text: bool = False) -> list[dict]:
+    """Load chunks_meta.jsonl as a list indexed by global chunk index.
+
+    The chunk text is by far the largest field; it is dropped unless the
+    caller needs it (pgvector upload), which cuts memory for collect by
+    roughly an order of magnitude. Without text, the index is read from
+    the slim copy written by prepare (~15x smaller on disk); if that is
+    missing or stale it is rebuilt from the full file on the way through.
+    """
+    if not include_text and _slim_meta_is_fresh():
+        return _read_meta_lines(META_SLIM_FILE, include_text=False)
+    if include_text:
+        return _read_meta_lines(META_FILE, include_text=True)
+
+    tmp = META_SLIM_FILE.with_suffix(".tmp")
+    with open(tmp, "wb") as slim:
+        meta_index = _read_meta_lines(META_FILE, include_text=False, slim_out=slim)
+    os.replace(tmp, META_SLIM_FILE)
+    return meta_index
+
+
+def load_dup_index() -> dict[int, list[dict]]:
+    """Load duplicate-text chunks grouped by the input index they reuse.
+
+    Each row in chunks_dups.jsonl is a text-free metadata row whose
+    ``idx`` is the embedding input of the first chunk with identical
+    text. Missing file (prepared before dedup) means no duplicates.
+    """
+    dups: dict[int, list[dict]] = {}
+    if DUPS_FILE.exists():
+        for meta in _read_meta_lines(DUPS_FILE, include_text=False):
+            dups.setdefault(meta["idx"], []).append(meta)
+    return dups
+
+
+def _read_meta_lines(path: Path, include_text: bool, slim_out=None) -> list[dict]:
+    """Parse a metadata JSONL file, optionally copying text-free rows out."""
+    intern = sys.intern
+    meta_index: list[dict] = []
+    with open(path, "rb") as mf:
+        for line in mf:
+            meta = _loads(line)
+            if not include_text:
+                meta.pop("text", None)
+                if slim_out is not None:
+                    slim_out.write(_dumps(meta) + b"\n")
+            # Files written before these fields existed: derive them once
+            # here so consumers can use plain key access.
+            if "court_level" not in meta:
+                meta["court_level"] = _detect_court_level(meta["court"])
+            if "subcourt" not in meta:
+                meta["subcourt"] = _detect_subcourt(meta["doc_id"], meta["court"])
+            meta.setdefault("jurisdiction", "")
+            for key in _INTERNED_META_FIELDS:
+                value = meta.get(key)
+                if isinstance(value, str):
+                    meta[key] = intern(value)
+            meta_index.append(meta)
+    return meta_index
 
 
 def _chunk_file(args: tuple) -> list[dict]:
@@ -169,7 +318,7 @@ def ensure_metadata_indexes() -> None:
     headers = _cf_json_headers()
 
     # List existing indexes
-    resp = http_requests.get(f"{base}/metadata_index/list", headers=headers, timeout=30)
+    resp = _CF_SESSION.get(f"{base}/metadata_index/list", headers=headers, timeout=30)
     if resp.status_code != 200:
         print(f"  Warning: could not list metadata indexes ({resp.status_code})")
         existing = []
@@ -188,7 +337,7 @@ def ensure_metadata_indexes() -> None:
             print(f"  ✓ {name} ({idx_def['indexType']}) — already exists")
             continue
 
-        resp = http_requests.post(
+        resp = _CF_SESSION.post(
             f"{base}/metadata_index/create",
             headers=headers,
             json=idx_def,
@@ -204,90 +353,154 @@ def ensure_metadata_indexes() -> None:
 
 # ── Step 1: Prepare ────────────────────────────────────────────────
 
+def _find_input_files(court: Optional[str] = None, limit: Optional[int] = None) -> list[str]:
+    """List the .md files under INPUT_DIR to chunk, largest first.
+
+    Walks the tree with os.walk on plain strings (no Path per file) and
+    applies the court filter before any stat. Files are put in path order
+    before the limit is applied, so --limit keeps picking the same subset.
+    """
+    base = str(INPUT_DIR)
+    prefix_len = len(base) + 1
+    paths = []
+    for dirpath, _dirnames, filenames in os.walk(base):
+        for name in filenames:
+            if not name.endswith(".md"):
+                continue
+            path = os.path.join(dirpath, name)
+            if court and _detect_court(path[prefix_len:]) != court:
+                continue
+            paths.append(path)
+    paths.sort(key=lambda p: p.split(os.sep))
+    if limit:
+        del paths[limit:]
+    paths.sort(key=lambda p: os.stat(p).st_size, reverse=True)
+    return paths
+
+
 def step_prepare(court: Optional[str] = None, limit: Optional[int] = None) -> None:
     """Chunk documents and create batch JSONL files."""
     BATCH_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Collect files
-    md_files = sorted(INPUT_DIR.rglob("*.md"))
-    if court:
-        md_files = [
-            f for f in md_files
-            if _detect_court(str(f.relative_to(INPUT_DIR))) == court
-        ]
-    if limit:
-        md_files = md_files[:limit]
+    md_files = _find_input_files(court=court, limit=limit)
 
-    print(f"\n[1/3] Chunking {len(md_files):,} documents...")
+    print(f"\nChunking {len(md_files):,} documents into metadata + batch files...")
     t0 = time.time()
     ncpu = multiprocessing.cpu_count()
-    work = [(str(f), str(INPUT_DIR)) for f in md_files]
-
-    all_chunks: list[dict] = []
-    with multiprocessing.Pool() as pool:
+    # Largest files first (LPT scheduling) with small chunks of work, so
+    # one worker isn't left chewing on a huge judgment at the tail.
+    # Output order is irrelevant: imap_unordered already reorders.
+    work = [(f, str(INPUT_DIR)) for f in md_files]
+    chunksize = max(1, len(work) // (ncpu * 20))
+
+    # Chunks are streamed straight into the metadata index and the batch
+    # files as workers return them, so memory stays bounded by one request
+    # line instead of holding every chunk of the corpus.
+    # Identical texts (captions, statutory boilerplate) are embedded once;
+    # later copies go to DUPS_FILE pointing at the first one's input.
+    seen_texts: dict[bytes, int] = {}
+    total_inputs = 0
+    total_dups = 0
+    batch_files: list[str] = []
+    batch_file = None
+    request_texts: list[str] = []
+
+    def flush_request() -> None:
+        """Write the pending texts as one embeddings request line."""
+        global_start = total_inputs - len(request_texts)
+        batch_idx = global_start // INPUTS_PER_BATCH
+        req_idx = global_start % INPUTS_PER_BATCH
+        line = {
+            "custom_id": f"b{batch_idx}-r{req_idx}-s{global_start}",
+            "method": "POST",
+            "url": "/v1/embeddings",
+            "body": {
+                "model": OPENAI_MODEL,
+                "input": request_texts,
+                "dimensions": OPENAI_DIMS,
+            },
+        }
+        batch_file.write(_dumps(line) + b"\n")
+        request_texts.clear()
+
+    def close_batch() -> None:
+        """Flush and close the current batch file."""
+        if request_texts:
+            flush_request()
+        batch_file.close()
+        inputs = total_inputs - (len(batch_files) - 1) * INPUTS_PER_BATCH
+        print(f"  {Path(batch_files[-1]).name}: {inputs:,} inputs")
+
+    with open(META_FILE, "wb") as mf, \
+            open(META_SLIM_FILE, "wb") as sf, \
+            open(DUPS_FILE, "wb") as df, \
+            multiprocessing.Pool() as pool:
         for result in tqdm(
-            pool.imap_unordered(_chunk_file, work, chunksize=200),
+            pool.imap_unordered(_chunk_file, work, chunksize=chunksize),
             total=len(md_files), desc="Chunking", unit="docs",
         ):
-            all_chunks.extend(result)
-
-    print(f"  {len(all_chunks):,} chunks in {time.time() - t0:.1f}s")
-
-    # Save metadata index (with text for pgvector upload)
-    print(f"\n[2/3] Saving metadata index...")
-    with open(META_FILE, "w", encoding="utf-8") as mf:
-        for i, chunk in enumerate(tqdm(all_chunks, desc="Metadata", unit="ch")):
-            meta = {
-                "idx": i,
-                "doc_id": chunk["doc_id"],
-                "court": chunk["court"],
-                "year": chunk["year"],
-                "title": chunk["title"][:200],
-                "chunk_index": chunk["chunk_index"],
-                "court_level": chunk.get("court_level", _detect_court_level(chunk["court"])),
-                "subcourt": chunk.get("subcourt", _detect_subcourt(chunk["doc_id"], chunk["court"])),
-                "jurisdiction": chunk.get("jurisdiction", ""),
-                "text": chunk["text"],  # chunk text for pgvector upload
-            }
-            mf.write(json.dumps(meta, ensure_ascii=False) + "\n")
-
-    # Create batch JSONL files
-    print(f"\n[3/3] Creating batch files...")
-    total_inputs = len(all_chunks)
-    num_batches = (total_inputs + INPUTS_PER_BATCH - 1) // INPUTS_PER_BATCH
-    batch_files = []
-
-    for batch_idx in range(num_batches):
-        batch_start = batch_idx * INPUTS_PER_BATCH
-        batch_end = min(batch_start + INPUTS_PER_BATCH, total_inputs)
-        batch_chunks = all_chunks[batch_start:batch_end]
-
-        fname = BATCH_DIR / f"batch_{batch_idx:03d}.jsonl"
-        with open(fname, "w", encoding="utf-8") as bf:
-            # Group into requests of INPUTS_PER_REQUEST
-            for req_idx in range(0, len(batch_chunks), INPUTS_PER_REQUEST):
-                req_chunks = batch_chunks[req_idx:req_idx + INPUTS_PER_REQUEST]
-                texts = [c["text"] for c in req_chunks]
-                global_start = batch_start + req_idx
-                line = {
-                    "custom_id": f"b{batch_idx}-r{req_idx}-s{global_start}",
-                    "method": "POST",
-                    "url": "/v1/embeddings",
-                    "body": {
-                        "model": OPENAI_MODEL,
-                        "input": texts,
-                        "dimensions": OPENAI_DIMS,
-                    },
-                }
-                bf.write(json.dumps(line, ensure_ascii=False) + "\n")
+            for chunk in result:
+                digest = hashlib.blake2b(
+                    chunk["text"].encode("utf-8"), digest_size=16
+                ).digest()
+                i = seen_texts.setdefault(digest, total_inputs)
+                if i != total_inputs:
+                    df.write(_dumps({
+                        "idx": i,
+                        "doc_id": chunk["doc_id"],
+                        "court": chunk["court"],
+                        "year": chunk["year"],
+                        "title": chunk["title"][:200],
+                        "chunk_index": chunk["chunk_index"],
+                        "court_level": chunk["court_level"],
+                        "subcourt": chunk["subcourt"],
+                        "jurisdiction": chunk["jurisdiction"],
+                    }) + b"\n")
+                    total_dups += 1
+                    continue
 
-        batch_files.append(str(fname))
-        print(f"  batch_{batch_idx:03d}.jsonl: {batch_end - batch_start:,} inputs")
+                if i % INPUTS_PER_BATCH == 0:
+                    if batch_file is not None:
+                        close_batch()
+                    fname = BATCH_DIR / f"batch_{len(batch_files):03d}.jsonl"
+                    batch_file = open(fname, "wb")
+                    batch_files.append(str(fname))
+
+                # Metadata index (with text for pgvector upload)
+                meta = {
+                    "idx": i,
+                    "doc_id": chunk["doc_id"],
+                    "court": chunk["court"],
+                    "year": chunk["year"],
+                    "title": chunk["title"][:200],
+                    "chunk_index": chunk["chunk_index"],
+                    "court_level": chunk["court_level"],
+                    "subcourt": chunk["subcourt"],
+                    "jurisdiction": chunk["jurisdiction"],
+                }
+                sf.write(_dumps(meta) + b"\n")
+                meta["text"] = chunk["text"]  # chunk text for pgvector upload
+                mf.write(_dumps(meta) + b"\n")
+
+                request_texts.append(chunk["text"])
+                total_inputs += 1
+                if len(request_texts) == INPUTS_PER_REQUEST:
+                    flush_request()
+
+    # Closing META_FILE may bump its mtime past the slim copy's; touch the
+    # slim file so load_meta_index() treats it as current.
+    META_SLIM_FILE.touch()
+    if batch_file is not None:
+        close_batch()
+    num_batches = len(batch_files)
+    print(f"  {total_inputs + total_dups:,} chunks in {time.time() - t0:.1f}s "
+          f"({total_dups:,} duplicate texts reuse an earlier embedding)")
 
     # Save state
     state = {
         "phase": "prepared",
-        "total_chunks": total_inputs,
+        "total_chunks": total_inputs + total_dups,
+        "total_inputs": total_inputs,
         "num_batches": num_batches,
         "batch_files": batch_files,
         "batches": [],
@@ -299,8 +512,32 @@ def step_prepare(court: Optional[str] = None, limit: Optional[int] = None) -> No
 
 # ── Step 2: Submit ──────────────────────────────────────────────────
 
+def _submit_batch_file(client: OpenAI, fpath: str) -> dict:
+    """Upload one batch JSONL file and create its OpenAI batch job."""
+    fname = Path(fpath).name
+    with open(fpath, "rb") as f:
+        file_obj = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=file_obj.id,
+        endpoint="/v1/embeddings",
+        completion_window="24h",
+        metadata={"description": f"cyprus-law-cases-search-revised embeddings {fname}"},
+    )
+    return {
+        "file": fpath,
+        "file_id": file_obj.id,
+        "batch_id": batch.id,
+        "status": batch.status,
+    }
+
+
 def step_submit() -> None:
-    """Upload batch files and create OpenAI batch jobs."""
+    """Upload batch files and create OpenAI batch jobs.
+
+    Files are uploaded SUBMIT_WORKERS at a time. State is saved after
+    each batch is created, so an interrupted submit never re-creates
+    (and pays for) batches that already exist.
+    """
     state = load_state()
     if state["phase"] not in ("prepared", "submitted"):
         print("Run 'prepare' first.")
@@ -312,47 +549,74 @@ def step_submit() -> None:
 
     print(f"\nSubmitting {len(batch_files)} batches to OpenAI Batch API...")
 
+    to_submit = []
     for fpath in batch_files:
         if fpath in existing_batches:
             b = existing_batches[fpath]
             if b.get("batch_id") and b.get("status") not in ("failed", "expired", "cancelled"):
                 print(f"  {Path(fpath).name}: already submitted (batch {b['batch_id']})")
                 continue
+        to_submit.append(fpath)
 
-        fname = Path(fpath).name
-        print(f"  Uploading {fname}...", end=" ", flush=True)
-
-        # Upload file
-        with open(fpath, "rb") as f:
-            file_obj = client.files.create(file=f, purpose="batch")
-
-        print(f"file_id={file_obj.id}", end=" ", flush=True)
-
-        # Create batch
-        batch = client.batches.create(
-            input_file_id=file_obj.id,
-            endpoint="/v1/embeddings",
-            completion_window="24h",
-            metadata={"description": f"cyprus-law-cases-search-revised embeddings {fname}"},
-        )
-
-        print(f"batch_id={batch.id} ✓")
-
-        existing_batches[fpath] = {
-            "file": fpath,
-            "file_id": file_obj.id,
-            "batch_id": batch.id,
-            "status": batch.status,
+    failed = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=SUBMIT_WORKERS) as pool:
+        futures = {
+            pool.submit(_submit_batch_file, client, fpath): fpath
+            for fpath in to_submit
         }
+        for future in concurrent.futures.as_completed(futures):
+            fpath = futures[future]
+            fname = Path(fpath).name
+            try:
+                b = future.result()
+            except Exception as exc:
+                failed += 1
+                print(f"  {fname}: ✗ {str(exc)[:150]}")
+                continue
+            print(f"  {fname}: file_id={b['file_id']} batch_id={b['batch_id']} ✓")
+            existing_batches[fpath] = b
+            state["batches"] = list(existing_batches.values())
+            save_state(state)
 
+    state["batches"] = [existing_batches[f] for f in batch_files if f in existing_batches]
+    if failed:
+        save_state(state)
+        print(f"\n{failed} batch(es) failed to submit. Run 'submit' again to retry them.")
+        return
     state["phase"] = "submitted"
-    state["batches"] = list(existing_batches.values())
     save_state(state)
     print(f"\nAll batches submitted. Run 'status' to check progress.")
 
 
 # ── Step 3: Status ──────────────────────────────────────────────────
 
+BATCH_LIST_PAGE = 100
+BATCH_LIST_MAX = 1000  # stop paging after this many listed batches
+
+
+def _fetch_batches(client: OpenAI, batch_ids: list[str]) -> dict:
+    """Fetch the current state of several OpenAI batches, keyed by ID.
+
+    Pages through ``batches.list`` (newest first) until every ID is seen,
+    so a poll costs a few round trips instead of one per batch. IDs not
+    found within BATCH_LIST_MAX listed batches are retrieved one by one.
+    """
+    wanted = set(batch_ids)
+    found = {}
+    if not wanted:
+        return found
+    for listed, batch in enumerate(client.batches.list(limit=BATCH_LIST_PAGE), 1):
+        if batch.id in wanted:
+            found[batch.id] = batch
+            if len(found) == len(wanted):
+                break
+        if listed >= BATCH_LIST_MAX:
+            break
+    for batch_id in wanted - found.keys():
+        found[batch_id] = client.batches.retrieve(batch_id)
+    return found
+
+
 def step_status() -> None:
     """Check status of all submitted batches."""
     state = load_state()
@@ -364,8 +628,9 @@ def step_status() -> None:
 
     print(f"\nBatch status ({len(state['batches'])} batches):")
     all_done = True
+    batches = _fetch_batches(client, [b["batch_id"] for b in state["batches"]])
     for b in state["batches"]:
-        batch = client.batches.retrieve(b["batch_id"])
+        batch = batches[b["batch_id"]]
         b["status"] = batch.status
         b["output_file_id"] = batch.output_file_id
         b["error_file_id"] = batch.error_file_id
@@ -402,18 +667,77 @@ def step_status() -> None:
 
 # ── Step 4: Collect ─────────────────────────────────────────────────
 
+# Whether upload bodies are gzip-compressed: unknown (None) until
+# _probe_gzip() has had one compressed vector accepted by Vectorize, and
+# switched off for the rest of the run if a gzip body is ever refused.
+_upload_gzip: Optional[bool] = None
+
+# Shared by all upload threads: a 429 on any of them halves the request
+# rate for everyone and holds them all for the Retry-After period.
+_UPLOAD_LIMITER = AdaptiveLimiter(max_rate=UPLOAD_MAX_RPS)
+
+
+def _probe_gzip(ndjson_line: bytes, cf_url: str, cf_headers: dict) -> bool:
+    """Upsert one vector gzip-encoded; True if Vectorize accepted it.
+
+    The vector is one the upload is about to send anyway, so the probe
+    writes nothing the run would not have written.
+    """
+    body = gzip.compress(ndjson_line, compresslevel=UPLOAD_GZIP_LEVEL)
+    headers = {**cf_headers, "Content-Encoding": "gzip"}
+    _UPLOAD_LIMITER.wait()
+    try:
+        resp = _CF_SESSION.post(cf_url, data=body, headers=headers, timeout=120)
+        accepted = resp.status_code == 200 and resp.json().get("success")
+    except (http_requests.RequestException, ValueError) as exc:
+        logger.warning("Gzip probe failed: %s", str(exc)[:100])
+        accepted = False
+    else:
+        if not accepted:
+            logger.warning("Gzip probe %d: %s", resp.status_code, resp.text[:150])
+    logger.info("Uploading %s bodies", "gzip" if accepted else "uncompressed")
+    return bool(accepted)
+
+
 def _upload_chunk(args: tuple) -> int:
-    """Upload one NDJSON chunk to Vectorize. Returns count uploaded."""
+    """Upload one NDJSON chunk to Vectorize. Returns count uploaded.
+
+    The body is gzip-compressed when the probe allowed it (vector floats
+    as text compress ~2x); runs in an upload worker thread, so
+    compression overlaps parsing.
+    """
+    global _upload_gzip
     ndjson_bytes, cf_url, cf_headers = args
-    session = http_requests.Session()
+    gz_body = None
     for attempt in range(5):
+        if _upload_gzip:
+            if gz_body is None:
+                gz_body = gzip.compress(ndjson_bytes, compresslevel=UPLOAD_GZIP_LEVEL)
+            body, headers = gz_body, {**cf_headers, "Content-Encoding": "gzip"}
+        else:
+            body, headers = ndjson_bytes, cf_headers
+        _UPLOAD_LIMITER.wait()
         try:
-            resp = session.post(cf_url, data=ndjson_bytes, headers=cf_headers, timeout=120)
+            resp = _CF_SESSION.post(cf_url, data=body, headers=headers, timeout=120)
             if resp.status_code == 200 and resp.json().get("success"):
+                _UPLOAD_LIMITER.record_success()
                 count = ndjson_bytes.count(b"\n") + 1
                 return count
+            if (
+                body is gz_body
+                and 400 <= resp.status_code < 500
+                and resp.status_code != 429
+            ):
+                logger.warning(
+                    "Vectorize rejected gzip body (%d); uploading uncompressed",
+                    resp.status_code,
+                )
+                _upload_gzip = False
+                continue
             if resp.status_code == 429:
-                time.sleep(min(2 ** attempt * 3, 60))
+                _UPLOAD_LIMITER.record_429(
+                    retry_after_seconds(resp.headers, attempt, base=3)
+                )
                 continue
             logger.warning("Upload %d: %s", resp.status_code, resp.text[:150])
         except http_requests.RequestException as exc:
@@ -423,11 +747,46 @@ def _upload_chunk(args: tuple) -> int:
     return 0
 
 
-def _parse_batch_vectors(content_text: str, meta_index: list) -> list:
-    """Parse OpenAI batch result into vector dicts."""
-    vectors = []
-    for line in content_text.strip().split("\n"):
-        resp = json.loads(line)
+# An embedding array inside a batch result line. Only keys are written
+# with bare quotes in JSON, so this cannot match inside a string value.
+_EMBEDDING_RE = re.compile(rb'"embedding"\s*:\s*(\[[^\]]*\])')
+
+
+def _parse_result_line(line: bytes) -> tuple[dict, list[bytes]]:
+    """Parse a batch result line but leave the embeddings as raw JSON.
+
+    Each ``"embedding": [...]`` array is cut out and replaced by its
+    position in the returned list, so the parse allocates a few small
+    objects instead of thousands of floats per input.
+    """
+    raws: list[bytes] = []
+
+    def stash(m: re.Match) -> bytes:
+        raws.append(m.group(1))
+        return b'"embedding":%d' % (len(raws) - 1)
+
+    return _loads(_EMBEDDING_RE.sub(stash, line)), raws
+
+
+def _iter_batch_vectors(
+    lines: Iterable, meta_index: list, dups: Optional[dict] = None,
+) -> Iterator[bytes]:
+    """Turn OpenAI batch result lines into Vectorize NDJSON lines.
+
+    Takes any iterable of JSONL lines (typically an open result file) so
+    a 50k-input batch never has to be held in memory as text or as a
+    full list of vectors. Each embedding is also yielded for every
+    duplicate-text chunk in ``dups`` (see load_dup_index) that reuses it.
+
+    The embedding text is copied verbatim into the output line rather
+    than parsed into floats and re-encoded (unless --round-floats needs
+    the values).
+    """
+    dups = dups or {}
+    for line in lines:
+        if not line.strip():
+            continue
+        resp, raws = _parse_result_line(line)
         response = resp.get("response", {})
         if response.get("status_code") != 200:
             continue
@@ -437,22 +796,62 @@ def _parse_batch_vectors(content_text: str, meta_index: list) -> list:
             idx = global_start + emb["index"]
             if idx >= len(meta_index):
                 continue
-            meta = meta_index[idx]
-            vectors.append({
-                "id": make_vector_id(meta["doc_id"], meta["chunk_index"]),
-                "values": emb["embedding"],
-                "metadata": {
+            values = raws[emb["embedding"]]
+            if UPLOAD_FLOAT_DECIMALS is not None:
+                values = _dumps([round(v, UPLOAD_FLOAT_DECIMALS) for v in _loads(values)])
+            for meta in (meta_index[idx], *dups.get(idx, ())):
+                vector_id = make_vector_id(meta["doc_id"], meta["chunk_index"])
+                metadata = {
                     "doc_id": meta["doc_id"],
                     "court": meta["court"],
                     "year": meta["year"],
                     "title": meta["title"],
                     "chunk_index": meta["chunk_index"],
-                    "court_level": meta.get("court_level", _detect_court_level(meta["court"])),
-                    "subcourt": meta.get("subcourt", _detect_subcourt(meta["doc_id"], meta["court"])),
-                    "jurisdiction": meta.get("jurisdiction", ""),
-                },
-            })
-    return vectors
+                    "court_level": meta["court_level"],
+                    "subcourt": meta["subcourt"],
+                    "jurisdiction": meta["jurisdiction"],
+                }
+                yield (b'{"id":' + _dumps(vector_id) + b',"values":' + values
+                       + b',"metadata":' + _dumps(metadata) + b"}")
+
+
+def _pack_upload_bodies(lines: Iterable[bytes]) -> Iterator[tuple[bytearray, int]]:
+    """Group NDJSON lines into upload bodies.
+
+    Each body holds at most UPLOAD_BATCH vectors and, unless a single line
+    is larger on its own, at most UPLOAD_MAX_BODY_BYTES bytes. Lines are
+    appended to one growing buffer as they are produced, so a body is
+    never held twice (as a list of lines and as their join).
+
+    Yields:
+        (ndjson_body, vector_count) tuples.
+    """
+    body = bytearray()
+    count = 0
+    for line in lines:
+        if count and (count >= UPLOAD_BATCH
+                      or len(body) + 1 + len(line) > UPLOAD_MAX_BODY_BYTES):
+            yield body, count
+            body = bytearray()
+            count = 0
+        if count:
+            body += b"\n"
+        body += line
+        count += 1
+    if count:
+        yield body, count
+
+
+def _download_output_file(client: OpenAI, file_id: str, out_path: Path) -> None:
+    """Stream an OpenAI batch output file to disk without buffering it.
+
+    Writes to a temp file first so an interrupted download never leaves a
+    truncated file that later runs would treat as cached.
+    """
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+    with client.files.with_streaming_response.content(file_id) as response:
+        response.stream_to_file(tmp_path)
+    os.replace(tmp_path, out_path)
 
 
 def step_download() -> None:
@@ -466,7 +865,9 @@ def step_download() -> None:
         print(f"Current phase: {state['phase']}. Run submit first.")
         return
 
-    openai_key = os.environ["OPENAI_API_KEY"]
+    # One client shared by all download threads, so they reuse its
+    # connection pool instead of each opening a fresh one
+    client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
     EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
 
     to_download = [
@@ -493,12 +894,10 @@ def step_download() -> None:
     t0 = time.time()
 
     def download_and_save(b: dict) -> str:
-        client = OpenAI(api_key=openai_key)
         out_path = _embedding_file(b)
         for attempt in range(1, MAX_RETRIES + 1):
             try:
-                content = client.files.content(b["output_file_id"])
-                out_path.write_text(content.text, encoding="utf-8")
+                _download_output_file(client, b["output_file_id"], out_path)
                 return Path(b["file"]).name
             except Exception as exc:
                 if attempt == MAX_RETRIES:
@@ -532,6 +931,7 @@ def _embedding_file(b: dict) -> Path:
 
 def step_collect() -> None:
     """Upload embeddings to Vectorize — uses local files if available, downloads if not."""
+    global _upload_gzip
     state = load_state()
     if state["phase"] not in ("submitted", "collecting", "done"):
         print(f"Current phase: {state['phase']}. Run submit first.")
@@ -540,15 +940,16 @@ def step_collect() -> None:
     # Ensure metadata indexes exist BEFORE uploading vectors
     ensure_metadata_indexes()
 
-    openai_key = os.environ["OPENAI_API_KEY"]
+    # One client shared by all download threads, so they reuse its
+    # connection pool instead of each opening a fresh one
+    client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
 
     # Load metadata index
     print(f"\nLoading metadata index...")
-    meta_index: list[dict] = []
-    with open(META_FILE, "r", encoding="utf-8") as mf:
-        for line in mf:
-            meta_index.append(json.loads(line))
-    print(f"  {len(meta_index):,} chunk metadata entries loaded.")
+    meta_index = load_meta_index()
+    dups = load_dup_index()
+    print(f"  {len(meta_index):,} chunk metadata entries loaded "
+          f"(+{sum(map(len, dups.values())):,} duplicate-text chunks).")
 
     cf_url = _cf_upsert_url()
     cf_headers = _cf_headers()
@@ -583,50 +984,34 @@ def step_collect() -> None:
     EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
 
     def load_batch(b: dict) -> tuple:
-        """Load embeddings from local cache, or download from OpenAI and cache."""
+        """Ensure embeddings are on local disk, downloading from OpenAI if needed."""
         cached = _embedding_file(b)
         if cached.exists():
-            return b, cached.read_text(encoding="utf-8"), "disk"
+            return b, cached, "disk"
         # Download and save for next time
-        client = OpenAI(api_key=openai_key)
-        content = client.files.content(b["output_file_id"])
-        cached.write_text(content.text, encoding="utf-8")
-        return b, content.text, "openai"
+        _download_output_file(client, b["output_file_id"], cached)
+        return b, cached, "openai"
 
     # Submit ALL loads at once — pool limits concurrency
     load_futures = {
         download_pool.submit(load_batch, b): b for b in to_collect
     }
 
+    # Uploads of a batch run in the background while the next batch is
+    # parsed; a batch is only recorded as collected once all its uploads
+    # have finished. At most MAX_PENDING_BATCHES batches of NDJSON are
+    # held in memory waiting for upload.
+    MAX_PENDING_BATCHES = 2
+    pending: collections.deque = collections.deque()
     batch_num = 0
-    for future in concurrent.futures.as_completed(load_futures):
-        batch_num += 1
-        b, content_text, source = future.result()
-        fname = Path(b["file"]).name
-        source_label = "cached" if source == "disk" else "downloaded"
-
-        # Parse vectors
-        vectors = _parse_batch_vectors(content_text, meta_index)
-        del content_text  # free memory
-
-        # Prepare NDJSON chunks for parallel upload
-        ndjson_chunks = []
-        for i in range(0, len(vectors), UPLOAD_BATCH):
-            chunk = vectors[i:i + UPLOAD_BATCH]
-            ndjson = "\n".join(
-                json.dumps(v, ensure_ascii=False, separators=(",", ":"))
-                for v in chunk
-            ).encode("utf-8")
-            ndjson_chunks.append((ndjson, cf_url, cf_headers))
-
-        del vectors  # free memory before upload
 
-        # Upload all chunks in parallel
-        upload_futures_list = [upload_pool.submit(_upload_chunk, c) for c in ndjson_chunks]
+    def finish_oldest_batch() -> None:
+        nonlocal batch_num, total_uploaded, total_failed
+        b, fname, source_label, upload_futures_list, batch_total = pending.popleft()
         batch_uploaded = sum(f.result() for f in upload_futures_list)
-        batch_total = sum(c[0].count(b"\n") + 1 for c in ndjson_chunks)
         batch_failed = batch_total - batch_uploaded
 
+        batch_num += 1
         total_uploaded += batch_uploaded
         total_failed += batch_failed
 
@@ -643,6 +1028,39 @@ def step_collect() -> None:
         state["total_uploaded"] = total_uploaded
         save_state(state)
 
+    for future in concurrent.futures.as_completed(load_futures):
+        b, embeddings_path, source = future.result()
+        fname = Path(b["file"]).name
+        source_label = "cached" if source == "disk" else "downloaded"
+
+        # Parse the result file line by line and hand each full request
+        # body to the upload pool as soon as it is serialized
+        upload_futures_list = []
+        batch_total = 0
+        with open(embeddings_path, "rb") as ef:
+            vectors = _iter_batch_vectors(ef, meta_index, dups)
+            for ndjson, count in _pack_upload_bodies(vectors):
+                if _upload_gzip is None:
+                    _upload_gzip = _probe_gzip(
+                        ndjson.split(b"\n", 1)[0], cf_url, cf_headers
+                    )
+                batch_total += count
+                upload_futures_list.append(
+                    upload_pool.submit(_upload_chunk, (ndjson, cf_url, cf_headers))
+                )
+        pending.append((b, fname, source_label, upload_futures_list, batch_total))
+
+        # Record batches whose uploads are done; block only when too many
+        # batches are queued for upload
+        while pending and (
+            len(pending) > MAX_PENDING_BATCHES
+            or all(f.done() for f in pending[0][3])
+        ):
+            finish_oldest_batch()
+
+    while pending:
+        finish_oldest_batch()
+
     download_pool.shutdown(wait=False)
     upload_pool.shutdown(wait=False)
 
@@ -705,7 +1123,7 @@ def step_create_index() -> None:
 
     # 1. Create index
     print(f"\n[1/2] Creating index '{VECTORIZE_INDEX}' (dims={OPENAI_DIMS}, metric=cosine)...")
-    resp = http_requests.post(
+    resp = _CF_SESSION.post(
         base,
         headers=headers,
         json={
@@ -797,7 +1215,7 @@ def step_full_reset() -> None:
 
     # 1. Delete existing index
     print(f"\n[1/4] Deleting index '{VECTORIZE_INDEX}'...")
-    resp = http_requests.delete(f"{base}/{VECTORIZE_INDEX}", headers=headers, timeout=30)
+    resp = _CF_SESSION.delete(f"{base}/{VECTORIZE_INDEX}", headers=headers, timeout=30)
     if resp.status_code == 200:
         print(f"  ✓ Index deleted")
     else:
@@ -809,7 +1227,7 @@ def step_full_reset() -> None:
 
     # 2. Recreate index
     print(f"\n[2/4] Creating index '{VECTORIZE_INDEX}' (dims={OPENAI_DIMS}, metric=cosine)...")
-    resp = http_requests.post(
+    resp = _CF_SESSION.post(
         base,
         headers=headers,
         json={
@@ -865,11 +1283,15 @@ def step_run(court: Optional[str] = None, limit: Optional[int] = None) -> None:
         client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
         print(f"\nPolling for batch completion...")
         while True:
+            pending = [
+                b for b in state["batches"]
+                if not b.get("collected")
+                and b["status"] not in ("completed", "failed", "expired", "cancelled")
+            ]
+            batches = _fetch_batches(client, [b["batch_id"] for b in pending])
             all_done = True
-            for b in state["batches"]:
-                if b.get("collected") or b["status"] in ("completed", "failed", "expired", "cancelled"):
-                    continue
-                batch_obj = client.batches.retrieve(b["batch_id"])
+            for b in pending:
+                batch_obj = batches[b["batch_id"]]
                 b["status"] = batch_obj.status
                 b["output_file_id"] = batch_obj.output_file_id
                 b["error_file_id"] = batch_obj.error_file_id
@@ -920,11 +1342,10 @@ def step_upload_pg() -> None:
         return
 
     print(f"\nLoading metadata index from {META_FILE}...")
-    meta_index = []
-    with open(META_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            meta_index.append(json.loads(line))
-    print(f"  {len(meta_index):,} chunks in metadata index")
+    meta_index = load_meta_index(include_text=True)
+    dups = load_dup_index()
+    print(f"  {len(meta_index):,} chunks in metadata index "
+          f"(+{sum(map(len, dups.values())):,} duplicate-text chunks)")
 
     # Collect embedding files
     embedding_files = sorted(EMBEDDINGS_DIR.glob("*_embeddings.jsonl"))
@@ -986,42 +1407,45 @@ def step_upload_pg() -> None:
 
     skipped_files = 0
     for ef in embedding_files:
-        content_text = ef.read_text(encoding="utf-8")
-        for line in content_text.strip().split("\n"):
-            if not line.strip():
-                continue
-            try:
-                resp = json.loads(line)
-            except json.JSONDecodeError:
-                skipped_files += 1
-                continue
-            response = resp.get("response", {})
-            if response.get("status_code") != 200:
-                continue
-            parts = resp["custom_id"].split("-")
-            global_start = int(parts[2][1:])
-            for emb in response["body"]["data"]:
-                idx = global_start + emb["index"]
-                if idx >= len(meta_index):
+        with open(ef, "rb") as lines:
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    resp = _loads(line)
+                except json.JSONDecodeError:  # orjson's error subclasses it
+                    skipped_files += 1
+                    continue
+                response = resp.get("response", {})
+                if response.get("status_code") != 200:
                     continue
-                meta = meta_index[idx]
-                # Truncate 3072d → 2000d (Matryoshka-compatible) — pgvector 2000d limit for all index types
-                truncated = emb["embedding"][:2000]
-                vec_str = "[" + ",".join(f"{v:.8f}" for v in truncated) + "]"
-                batch_buf.append((
-                    meta["doc_id"],
-                    meta["chunk_index"],
-                    meta.get("text", ""),  # chunk text
-                    vec_str,
-                    meta["court"],
-                    meta.get("court_level", _detect_court_level(meta["court"])),
-                    meta["year"],
-                    meta["title"],
-                    meta.get("subcourt", _detect_subcourt(meta["doc_id"], meta["court"])),
-                    meta.get("jurisdiction", ""),
-                ))
-                if len(batch_buf) >= COPY_BATCH:
-                    flush_batch()
+                parts = resp["custom_id"].split("-")
+                global_start = int(parts[2][1:])
+                for emb in response["body"]["data"]:
+                    idx = global_start + emb["index"]
+                    if idx >= len(meta_index):
+                        continue
+                    text = meta_index[idx].get("text", "")  # chunk text
+                    # Truncate 3072d → 2000d (Matryoshka-compatible) — pgvector 2000d limit for all index types
+                    truncated = emb["embedding"][:2000]
+                    # pgvector accepts the JSON array as-is: one C-level encode
+                    # instead of a Python f-string per component
+                    vec_str = _dumps(truncated).decode()
+                    for meta in (meta_index[idx], *dups.get(idx, ())):
+                        batch_buf.append((
+                            meta["doc_id"],
+                            meta["chunk_index"],
+                            text,
+                            vec_str,
+                            meta["court"],
+                            meta["court_level"],
+                            meta["year"],
+                            meta["title"],
+                            meta["subcourt"],
+                            meta["jurisdiction"],
+                        ))
+                    if len(batch_buf) >= COPY_BATCH:
+                        flush_batch()
 
     # Flush remaining
     flush_batch()
@@ -1058,6 +1482,7 @@ def step_upload_pg() -> None:
 # ── CLI ─────────────────────────────────────────────────────────────
 
 def main():
+    global VECTORIZE_INDEX, UPLOAD_FLOAT_DECIMALS, UPLOAD_MAX_BODY_BYTES
     parser = argparse.ArgumentParser(
         description="Ingest cases → OpenAI Batch API → Cloudflare Vectorize"
     )
@@ -1073,11 +1498,19 @@ def main():
     parser.add_argument("--court", type=str, default=None)
     parser.add_argument("--index", type=str, default=VECTORIZE_INDEX_DEFAULT,
                         help=f"Vectorize index name (default: {VECTORIZE_INDEX_DEFAULT})")
+    parser.add_argument("--round-floats", type=int, default=None, metavar="N",
+                        help="Round vector components to N decimals on upload "
+                             "(smaller payloads; default: no rounding)")
+    parser.add_argument("--max-body-mb", type=float,
+                        default=UPLOAD_MAX_BODY_BYTES / (1024 * 1024),
+                        help="Max NDJSON body per Vectorize request in MB "
+                             "(default: %(default).0f)")
     parser.add_argument("-v", "--verbose", action="store_true")
     args = parser.parse_args()
 
-    global VECTORIZE_INDEX
     VECTORIZE_INDEX = args.index
+    UPLOAD_FLOAT_DECIMALS = args.round_floats
+    UPLOAD_MAX_BODY_BYTES = int(args.max_body_mb * 1024 * 1024)
 
     logging.basicConfig(
         level=logging.DEBUG if args.verbose else logging.WARNING,
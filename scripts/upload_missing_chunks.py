@@ -1,7 +1,9 @@
 """Upload missing embedding batches to PostgreSQL (incremental, no TRUNCATE).
 
-Reads specific embedding files + chunks_meta.jsonl, inserts only NEW chunks
-using INSERT ... ON CONFLICT DO NOTHING.
+Reads specific embedding files + chunks_meta.jsonl (plus chunks_dups.jsonl
+for duplicate-text chunks), binary-COPYs them into a temporary staging
+table and inserts only NEW chunks using
+INSERT ... SELECT ... ON CONFLICT DO NOTHING.
 
 Usage:
     # Upload specific batches (017, 040 already downloaded):
@@ -10,6 +12,9 @@ Usage:
     # Upload all 3 missing batches after batch 019 is ready:
     python scripts/upload_missing_chunks.py --batches 17 19 40
 
+    # Upload now, rebuild the vector index after a later run:
+    python scripts/upload_missing_chunks.py --batches 17 --no-reindex
+
 Environment:
     DATABASE_URL — PostgreSQL connection string
 """
@@ -17,9 +22,14 @@ Environment:
 import argparse
 import io
 import json
+import multiprocessing
 import os
+import struct
 import sys
+import threading
 import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -27,9 +37,136 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from rag.chunker import _detect_court_level, _detect_subcourt
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib parser
+    orjson = None
+
 META_FILE = PROJECT_ROOT / "data" / "batch_embed" / "chunks_meta.jsonl"
+DUPS_FILE = PROJECT_ROOT / "data" / "batch_embed" / "chunks_dups.jsonl"
 EMBEDDINGS_DIR = PROJECT_ROOT / "data" / "batch_embed" / "embeddings"
+META_OFFSETS_FILE = META_FILE.with_suffix(".offsets")
 CHUNKS_PER_BATCH = 50_000
+READ_BUFFER_BYTES = 4 * 1024 * 1024  # buffer for front-to-back JSONL scans
+PARSE_CHUNKSIZE = 4  # result lines handed to each reader process at a time
+PARSE_AHEAD = 64  # max result lines read but not yet taken by the main loop
+
+
+# Binary COPY framing: fields are length-prefixed, so text needs no escaping
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack("!h", -1)
+_CHUNK_COLUMNS = ("doc_id", "chunk_index", "content", "embedding",
+                  "court", "court_level", "year", "title", "subcourt", "jurisdiction")
+
+
+def _loads(data: bytes):
+    """Parse one JSON line (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _open_sequential(path: Path):
+    """Open a JSONL file in binary mode for one front-to-back pass.
+
+    Uses a large read buffer and, where the OS supports it, advises the
+    kernel that access is sequential so it reads further ahead.
+    """
+    f = open(path, "rb", buffering=READ_BUFFER_BYTES)
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return f
+
+
+def _load_meta_offsets() -> array:
+    """Byte offset of every line in META_FILE, cached in META_OFFSETS_FILE.
+
+    Built with one sequential scan the first time (or after META_FILE
+    changes); later runs seek straight to the batches they need instead
+    of reading through every line before them.
+    """
+    offsets = array("Q")
+    if (META_OFFSETS_FILE.exists()
+            and META_OFFSETS_FILE.stat().st_mtime >= META_FILE.stat().st_mtime):
+        offsets.frombytes(META_OFFSETS_FILE.read_bytes())
+        return offsets
+
+    pos = 0
+    with _open_sequential(META_FILE) as f:
+        for line in f:
+            offsets.append(pos)
+            pos += len(line)
+    tmp = META_OFFSETS_FILE.with_suffix(".tmp")
+    tmp.write_bytes(offsets.tobytes())
+    os.replace(tmp, META_OFFSETS_FILE)
+    return offsets
+
+
+def _parse_result_line(line: bytes) -> tuple[int, list[tuple[int, bytes]]] | None:
+    """Parse one batch result line into (global_start, [(index, vector field)]).
+
+    Runs in a reader process: the JSON parse and the float packing are
+    the CPU-heavy part of an upload. Returns None for blank, malformed or
+    failed lines.
+    """
+    if not line.strip():
+        return None
+    try:
+        resp = _loads(line)
+    except json.JSONDecodeError:  # orjson's error subclasses it
+        return None
+
+    response = resp.get("response", {})
+    if response.get("status_code") != 200:
+        return None
+
+    # Both the original (batch-019-s950000) and resubmitted
+    # (emb-b19-s950000) custom_id formats keep the start in part 3
+    global_start = int(resp["custom_id"].split("-")[2][1:])
+    # Truncate 3072d → 2000d (pgvector limit)
+    return global_start, [
+        (emb["index"], _vector_field(emb["embedding"][:2000]))
+        for emb in response["body"]["data"]
+    ]
+
+
+def _vector_field(values: list[float]) -> bytes:
+    """Encode a vector as a length-prefixed binary COPY field.
+
+    pgvector's binary input is int16 dimensions, int16 unused, then one
+    big-endian float4 per component, so nothing is formatted as text on
+    this side or parsed back on the server.
+    """
+    n = len(values)
+    return struct.pack(f"!ihh{n}f", 4 + 4 * n, n, 0, *values)
+
+
+def _write_text_fields(buf: io.BytesIO, *values: str) -> None:
+    """Write each value as a length-prefixed UTF-8 field."""
+    for value in values:
+        data = value.encode("utf-8")
+        buf.write(struct.pack("!i", len(data)))
+        buf.write(data)
+
+
+def _copy_rows(rows: list[tuple]) -> io.BytesIO:
+    """Build a binary COPY stream for rows in _CHUNK_COLUMNS order."""
+    buf = io.BytesIO()
+    buf.write(_PGCOPY_HEADER)
+    field_count = struct.pack("!h", len(_CHUNK_COLUMNS))
+    for (doc_id, chunk_index, content, vector, court, court_level,
+         year, title, subcourt, jurisdiction) in rows:
+        buf.write(field_count)
+        _write_text_fields(buf, doc_id)
+        buf.write(struct.pack("!ii", 4, chunk_index))  # INT column: 4-byte int
+        _write_text_fields(buf, content)
+        buf.write(vector)  # already framed by _vector_field
+        _write_text_fields(buf, court, court_level)
+        buf.write(struct.pack("!ii", 4, int(year or 0)))
+        _write_text_fields(buf, title, subcourt, jurisdiction)
+    buf.write(_PGCOPY_TRAILER)
+    buf.seek(0)
+    return buf
 
 
 def main():
@@ -38,6 +175,8 @@ def main():
                         help="Batch indices to upload (e.g., 17 19 40)")
     parser.add_argument("--batch-size", type=int, default=5000,
                         help="COPY batch size (default: 5000)")
+    parser.add_argument("--no-reindex", action="store_true",
+                        help="Skip the IVFFlat REINDEX (e.g. when more uploads follow)")
     args = parser.parse_args()
 
     try:
@@ -66,25 +205,32 @@ def main():
         end = start + CHUNKS_PER_BATCH
         needed_ranges.append((b, start, end))
     
-    min_idx = min(s for _, s, _ in needed_ranges)
-    max_idx = max(e for _, _, e in needed_ranges)
-    
+    offsets = _load_meta_offsets()
     meta_index = {}
-    with open(META_FILE) as f:
-        for i, line in enumerate(f):
-            if i < min_idx:
+    with open(META_FILE, "rb") as f:
+        for _, start, end in needed_ranges:
+            if start >= len(offsets):
                 continue
-            if i >= max_idx:
-                break
-            for _, start, end in needed_ranges:
-                if start <= i < end:
-                    meta_index[i] = json.loads(line)
-                    break
+            f.seek(offsets[start])
+            for i in range(start, min(end, len(offsets))):
+                meta_index[i] = _loads(f.readline())
     print(f"  Loaded {len(meta_index):,} metadata entries")
 
+    # Chunks whose text duplicated an earlier chunk reuse its embedding
+    dups = {}
+    if DUPS_FILE.exists():
+        with _open_sequential(DUPS_FILE) as f:
+            for line in f:
+                row = _loads(line)
+                if row["idx"] in meta_index:
+                    dups.setdefault(row["idx"], []).append(row)
+    if dups:
+        print(f"  Loaded {sum(map(len, dups.values())):,} duplicate-text entries")
+
     # Connect to PostgreSQL
     conn = psycopg2.connect(database_url)
     conn.autocommit = False
+    conn.set_client_encoding("UTF8")  # binary COPY sends text as UTF-8
     cur = conn.cursor()
 
     # Get current count
@@ -95,97 +241,132 @@ def main():
     # Process each batch
     total_inserted = 0
     total_skipped = 0
-    columns = ("doc_id", "chunk_index", "content", "embedding",
-               "court", "court_level", "year", "title", "subcourt", "jurisdiction")
-    
+    column_list = ", ".join(_CHUNK_COLUMNS)
+    # Session-local staging table with the chunk columns (no id, defaults
+    # or constraints); every flush commits, which empties it
+    cur.execute(
+        f"CREATE TEMP TABLE chunks_stage ON COMMIT DELETE ROWS AS "
+        f"SELECT {column_list} FROM chunks WITH NO DATA"
+    )
+    insert_sql = (
+        f"INSERT INTO chunks ({column_list}) "
+        f"SELECT {column_list} FROM chunks_stage "
+        f"ON CONFLICT (doc_id, chunk_index) DO NOTHING"
+    )
+
     t0 = time.time()
 
+    def write_rows(batch_idx: int, rows: list[tuple]) -> int:
+        """COPY rows into the staging table, then move them over with
+        INSERT ... ON CONFLICT DO NOTHING to skip existing chunks."""
+        nonlocal total_inserted, total_skipped
+        cur.copy_expert(
+            f"COPY chunks_stage ({column_list}) FROM STDIN WITH (FORMAT binary)",
+            _copy_rows(rows),
+        )
+        cur.execute(insert_sql)
+        inserted = cur.rowcount
+        conn.commit()
+        total_inserted += inserted
+        total_skipped += len(rows) - inserted
+        elapsed = time.time() - t0
+        rate = total_inserted / elapsed if elapsed > 0 else 0
+        print(f"  {total_inserted:>10,} inserted ({rate:.0f}/s) [{total_skipped} skipped]", 
+              end="\r", flush=True)
+        return inserted
+
+    # One writer thread runs COPY/INSERT while the main thread parses the
+    # next rows (psycopg2 releases the GIL while it waits on the server).
+    # At most one flush is in flight, so at most two batches are in memory.
+    writer = ThreadPoolExecutor(max_workers=1)
+    pending = []
+    # Parse in reader processes when there are cores to spare; on one
+    # core the pickling round trip would only add work
+    pool = multiprocessing.Pool() if multiprocessing.cpu_count() > 1 else None
+
+    def flush_batch():
+        nonlocal batch_buf
+        if not batch_buf:
+            return
+        if pending:
+            pending[-1].result()
+        pending.append(writer.submit(write_rows, batch_idx, batch_buf))
+        batch_buf = []
+
     for batch_idx in args.batches:
         emb_file = EMBEDDINGS_DIR / f"batch_{batch_idx:03d}_embeddings.jsonl"
-        batch_start = batch_idx * CHUNKS_PER_BATCH
         
         print(f"\nProcessing batch_{batch_idx:03d}...")
         batch_buf = []
-        batch_inserted = 0
-        
-        def flush_batch():
-            nonlocal total_inserted, batch_inserted, total_skipped
-            if not batch_buf:
-                return
-            # Use INSERT ... ON CONFLICT DO NOTHING to handle duplicates
-            values_parts = []
-            params = []
-            for row in batch_buf:
-                values_parts.append("(%s, %s, %s, %s::vector, %s, %s, %s, %s, %s, %s)")
-                params.extend(row)
-            
-            sql = f"""
-                INSERT INTO chunks ({', '.join(columns)})
-                VALUES {', '.join(values_parts)}
-                ON CONFLICT (doc_id, chunk_index) DO NOTHING
-            """
-            cur.execute(sql, params)
-            inserted = cur.rowcount
-            conn.commit()
-            total_inserted += inserted
-            batch_inserted += inserted
-            total_skipped += len(batch_buf) - inserted
-            elapsed = time.time() - t0
-            rate = total_inserted / elapsed if elapsed > 0 else 0
-            print(f"  {total_inserted:>10,} inserted ({rate:.0f}/s) [{total_skipped} skipped]", 
-                  end="\r", flush=True)
-            batch_buf.clear()
-
-        for line in open(emb_file):
-            if not line.strip():
-                continue
-            try:
-                resp = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            
-            response = resp.get("response", {})
-            if response.get("status_code") != 200:
-                continue
-            
-            custom_id = resp["custom_id"]
-            # Handle both original format (emb-bNNN-sNNNNN) and batch_ingest format (batch-NNN-sNNNNN)
-            parts = custom_id.split("-")
-            if custom_id.startswith("emb-"):
-                # Resubmitted format: emb-b19-s950000
-                global_start = int(parts[2][1:])
+        pending.clear()
+
+        # Reader processes parse and pack each result line; imap keeps
+        # file order. Each line holds a slot until its result is taken,
+        # so at most PARSE_AHEAD lines (~4 MB each) are in flight
+        read_slots = threading.Semaphore(PARSE_AHEAD)
+        stop_reading = False
+
+        def gated_lines():
+            with _open_sequential(emb_file) as f:
+                for line in f:
+                    read_slots.acquire()
+                    if stop_reading:
+                        return
+                    yield line
+
+        try:
+            if pool is not None:
+                results = pool.imap(_parse_result_line, gated_lines(), chunksize=PARSE_CHUNKSIZE)
             else:
-                # Original format: batch-019-s950000
-                global_start = int(parts[2][1:])
-            
-            for emb in response["body"]["data"]:
-                idx = global_start + emb["index"]
-                meta = meta_index.get(idx)
-                if meta is None:
+                results = map(_parse_result_line, gated_lines())
+            for parsed in results:
+                read_slots.release()
+                if parsed is None:
                     continue
-                
-                # Truncate 3072d → 2000d (pgvector limit)
-                truncated = emb["embedding"][:2000]
-                vec_str = "[" + ",".join(f"{v:.8f}" for v in truncated) + "]"
-                
-                batch_buf.append((
-                    meta["doc_id"],
-                    meta["chunk_index"],
-                    meta.get("text", ""),
-                    vec_str,
-                    meta["court"],
-                    meta.get("court_level", _detect_court_level(meta["court"])),
-                    meta["year"],
-                    meta["title"],
-                    meta.get("subcourt", _detect_subcourt(meta["doc_id"], meta["court"])),
-                    meta.get("jurisdiction", ""),
-                ))
-                if len(batch_buf) >= args.batch_size:
-                    flush_batch()
+                global_start, vectors = parsed
+                for index, vector in vectors:
+                    idx = global_start + index
+                    meta = meta_index.get(idx)
+                    if meta is None:
+                        continue
+
+                    text = meta.get("text", "")
+                    for row in (meta, *dups.get(idx, ())):
+                        # Older meta files lack the derived fields; detect
+                        # them only then (a .get default is always evaluated)
+                        court_level = row.get("court_level")
+                        if court_level is None:
+                            court_level = _detect_court_level(row["court"])
+                        subcourt = row.get("subcourt")
+                        if subcourt is None:
+                            subcourt = _detect_subcourt(row["doc_id"], row["court"])
+                        batch_buf.append((
+                            row["doc_id"],
+                            row["chunk_index"],
+                            text,
+                            vector,
+                            row["court"],
+                            court_level,
+                            row["year"],
+                            row["title"],
+                            subcourt,
+                            row.get("jurisdiction", ""),
+                        ))
+                    if len(batch_buf) >= args.batch_size:
+                        flush_batch()
+        finally:
+            # Unblock the task feeder if we stop early
+            stop_reading = True
+            read_slots.release(PARSE_AHEAD)
         
         flush_batch()
+        batch_inserted = sum(f.result() for f in pending)
         print(f"\n  batch_{batch_idx:03d}: {batch_inserted:,} chunks inserted")
 
+    writer.shutdown()
+    if pool is not None:
+        pool.close()
+
     elapsed = time.time() - t0
     
     # Verify final count
@@ -203,18 +384,26 @@ def main():
     print(f"  Unique docs: {unique_docs:>10,}")
     print(f"{'=' * 60}")
 
-    # REINDEX since we added significant data to IVFFlat
-    print("\nREINDEXing chunks.embedding (IVFFlat needs rebuild for new data)...")
+    # End the transaction the counts above opened: psycopg2 cannot switch
+    # to autocommit inside one, and REINDEX CONCURRENTLY needs autocommit
+    conn.commit()
     conn.autocommit = True
-    cur.execute("SET maintenance_work_mem = '2GB'")
-    idx_t0 = time.time()
-    cur.execute("REINDEX INDEX idx_chunks_embedding")
-    idx_elapsed = time.time() - idx_t0
-    print(f"  REINDEX done in {idx_elapsed:.0f}s")
+    if args.no_reindex:
+        print("\nSkipping REINDEX (--no-reindex); run it after the last upload:")
+        print("  REINDEX INDEX CONCURRENTLY idx_chunks_embedding;")
+    else:
+        # REINDEX since we added significant data to IVFFlat. CONCURRENTLY
+        # builds the new index alongside the old one, so searches keep
+        # using the old index instead of blocking for the ~13 min rebuild
+        print("\nREINDEXing chunks.embedding (IVFFlat needs rebuild for new data)...")
+        cur.execute("SET maintenance_work_mem = '2GB'")
+        idx_t0 = time.time()
+        cur.execute("REINDEX INDEX CONCURRENTLY idx_chunks_embedding")
+        idx_elapsed = time.time() - idx_t0
+        print(f"  REINDEX done in {idx_elapsed:.0f}s")
 
     print("Running ANALYZE chunks...")
     cur.execute("ANALYZE chunks")
-    conn.commit()
 
     cur.close()
     conn.close()
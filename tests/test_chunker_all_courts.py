@@ -12,6 +12,7 @@ Picks real documents from every court directory, chunks them, and verifies:
   9. Metadata fields are populated (doc_id, court, year, title)
 """
 
+import multiprocessing
 import os
 import re
 import sys
@@ -74,17 +75,31 @@ PATH_JURISDICTIONS = {
 # ── Helpers ──────────────────────────────────────────────────────
 
 LINK_RE = re.compile(r"\[[^\]]*\]\([^)]*\)")
+HEADING_RE = re.compile(r"^##\s", re.MULTILINE)
 C1_RE = re.compile(r"[\x80-\x9f]")
 HEADER_PREFIX = "Δικαστήριο:"
 TAIL_MIN_CHARS = 500  # chunks smaller than this should have been merged
 
 
-def pick_files(court_dir: str, n: int = 3) -> list[Path]:
-    """Pick up to n .md files from a court directory."""
-    full = DATA_DIR / court_dir
-    if not full.exists():
-        return []
-    files = sorted(full.rglob("*.md"))
+def find_court_files() -> dict[str, list[Path]]:
+    """Bucket the .md files under DATA_DIR by COURT_MATRIX directory.
+
+    One walk of the data tree instead of one rglob per court; files keep
+    sorted path order within each bucket.
+    """
+    by_court: dict[str, list[Path]] = {entry[0]: [] for entry in COURT_MATRIX}
+    for fp in sorted(DATA_DIR.rglob("*.md")):
+        parts = fp.relative_to(DATA_DIR).parts
+        for depth in range(1, len(parts)):
+            files = by_court.get("/".join(parts[:depth]))
+            if files is not None:
+                files.append(fp)
+                break
+    return by_court
+
+
+def pick_files(files: list[Path], n: int = 3) -> list[Path]:
+    """Pick up to n files from a court's sorted file list."""
     # Pick from start, middle, end for diversity
     if len(files) <= n:
         return files
@@ -118,12 +133,12 @@ def check_chunks(chunks, court_dir, expected_court, expected_level,
             errors.append(f"{tag} Contains bold markdown (**)")
 
         # 4. No heading markdown (## at start of line)
-        if re.search(r"^##\s", chunk.text, re.MULTILINE):
+        if HEADING_RE.search(chunk.text):
             errors.append(f"{tag} Contains heading markdown (##)")
 
         # 5. No markdown links [text](url)
-        if LINK_RE.search(chunk.text):
-            match = LINK_RE.search(chunk.text)
+        match = LINK_RE.search(chunk.text)
+        if match:
             errors.append(f"{tag} Contains markdown link: {match.group()[:80]}")
 
         # 6. No C1 control chars
@@ -195,6 +210,37 @@ def check_chunks(chunks, court_dir, expected_court, expected_level,
     return errors
 
 
+def check_court(task: tuple) -> tuple[str, int, int, list[str]]:
+    """Chunk and check the picked files of one court.
+
+    Takes ((court_dir, expected_court, expected_level,
+    jurisdiction_source), files). Returns (court_dir, files checked,
+    chunks produced, errors). Runs in a worker process.
+    """
+    (court_dir, expected_court, expected_level, jurisdiction_source), files = task
+    total_chunks = 0
+    court_errors = []
+
+    for fp in files:
+        doc_id = str(fp.relative_to(DATA_DIR))
+        text = fp.read_text(encoding="utf-8")
+
+        try:
+            chunks = chunk_document(text, doc_id)
+        except Exception as exc:
+            court_errors.append(f"[{court_dir} / {doc_id}] CRASH: {exc}")
+            continue
+
+        total_chunks += len(chunks)
+        errs = check_chunks(
+            chunks, court_dir, expected_court, expected_level,
+            jurisdiction_source, doc_id,
+        )
+        court_errors.extend(errs)
+
+    return court_dir, len(files), total_chunks, court_errors
+
+
 # ── Main test runner ─────────────────────────────────────────────
 
 def main():
@@ -213,37 +259,26 @@ def main():
     print("=" * 70)
     print()
 
-    for court_dir, expected_court, expected_level, jurisdiction_source in COURT_MATRIX:
-        files = pick_files(court_dir, n=10)
-        if not files:
+    by_court = find_court_files()
+    tasks = [(entry, pick_files(by_court[entry[0]], n=10)) for entry in COURT_MATRIX]
+
+    # Courts are checked in parallel; imap keeps the report in matrix order
+    with multiprocessing.Pool() as pool:
+        results = list(pool.imap(check_court, tasks))
+
+    for court_dir, n_files, n_chunks, court_errors in results:
+        if not n_files:
             courts_skipped.append(court_dir)
             continue
 
         courts_tested += 1
-        court_errors = []
-
-        for fp in files:
-            doc_id = str(fp.relative_to(DATA_DIR))
-            text = fp.read_text(encoding="utf-8")
-            total_docs += 1
-
-            try:
-                chunks = chunk_document(text, doc_id)
-            except Exception as exc:
-                court_errors.append(f"[{court_dir} / {doc_id}] CRASH: {exc}")
-                continue
-
-            total_chunks += len(chunks)
-            errs = check_chunks(
-                chunks, court_dir, expected_court, expected_level,
-                jurisdiction_source, doc_id,
-            )
-            court_errors.extend(errs)
+        total_docs += n_files
+        total_chunks += n_chunks
 
         # Report per court
         status = "FAIL" if court_errors else "OK"
         icon = "✗" if court_errors else "✓"
-        print(f"  {icon} {court_dir:<40} [{len(files)} docs] {status}")
+        print(f"  {icon} {court_dir:<40} [{n_files} docs] {status}")
         if court_errors:
             for err in court_errors[:5]:  # Show first 5 errors per court
                 print(f"      {err}")
@@ -34,8 +34,24 @@ class TestRateLimiting:
 
         # Sleep should have been called at least once after the first fetch
         assert mock_sleep.call_count >= 1
-        # Verify delay value
-        mock_sleep.assert_called_with(0.75)
+        # Only the remainder of the delay is slept, not the full delay again
+        slept = mock_sleep.call_args.args[0]
+        assert 0 < slept <= 0.75
+
+    @patch("scraper.fetcher.requests.Session")
+    @patch("scraper.fetcher.time.sleep")
+    def test_concurrent_callers_get_distinct_slots(
+        self, mock_sleep, mock_session_cls
+    ):
+        fetcher = Fetcher(cache_dir=None, delay=1.0)
+        fetcher._rate_limit()  # first request goes out immediately
+        fetcher._rate_limit()
+        fetcher._rate_limit()
+        # Back-to-back callers queue up one delay apart
+        waits = [c.args[0] for c in mock_sleep.call_args_list]
+        assert len(waits) == 2
+        assert 0.9 < waits[0] <= 1.0
+        assert 1.9 < waits[1] <= 2.0
 
 
 class TestCaching:
@@ -70,6 +86,30 @@ class TestCaching:
         # Still only 1 network call
         assert session_instance.get.call_count == 1
 
+    @patch("scraper.fetcher.requests.Session")
+    def test_memory_cache_serves_without_disk_read(
+        self, mock_session_cls, tmp_path
+    ):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "<html>in memory</html>"
+        mock_response.encoding = "utf-8"
+
+        session_instance = MagicMock()
+        session_instance.get.return_value = mock_response
+        mock_session_cls.return_value = session_instance
+
+        cache_dir = tmp_path / "cache"
+        fetcher = Fetcher(cache_dir=str(cache_dir), delay=0)
+        url = "https://example.com/page1"
+        fetcher.fetch(url)
+
+        # Remove the disk copy: the in-memory LRU should still serve it
+        for cached_file in cache_dir.iterdir():
+            cached_file.unlink()
+        assert fetcher.fetch(url) == "<html>in memory</html>"
+        assert session_instance.get.call_count == 1
+
     @patch("scraper.fetcher.requests.Session")
     def test_no_cache_when_cache_dir_is_none(self, mock_session_cls):
         mock_response = MagicMock()
@@ -87,6 +127,54 @@ class TestCaching:
         # Without cache, both calls hit the network
         assert session_instance.get.call_count == 2
 
+    @patch("scraper.fetcher.requests.Session")
+    def test_one_pooled_session_serves_all_urls(self, mock_session_cls):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "<html></html>"
+        mock_response.encoding = "utf-8"
+
+        session_instance = MagicMock()
+        session_instance.get.return_value = mock_response
+        mock_session_cls.return_value = session_instance
+
+        fetcher = Fetcher(cache_dir=None, delay=0)
+        fetcher.fetch("https://example.com/p1")
+        fetcher.fetch("https://example.com/p2")
+        # Both requests go through the same keep-alive session
+        assert mock_session_cls.call_count == 1
+        assert session_instance.get.call_count == 2
+        mounted = {c.args[0]: c.args[1] for c in session_instance.mount.call_args_list}
+        assert set(mounted) == {"https://", "http://"}
+        adapter = mounted["https://"]
+        assert adapter is mounted["http://"]
+        assert adapter._pool_maxsize >= adapter._pool_connections > 1
+
+    @patch("scraper.fetcher.requests.Session")
+    def test_failed_cache_write_leaves_no_file(self, mock_session_cls, tmp_path):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "<html>page</html>"
+        mock_response.encoding = "utf-8"
+
+        session_instance = MagicMock()
+        session_instance.get.return_value = mock_response
+        mock_session_cls.return_value = session_instance
+
+        cache_dir = tmp_path / "cache"
+        fetcher = Fetcher(cache_dir=str(cache_dir), delay=0)
+        real_write_text = Path.write_text
+
+        def write_half(self, data, *args, **kwargs):
+            real_write_text(self, data[: len(data) // 2], *args, **kwargs)
+            raise OSError("disk full")
+
+        with patch.object(Path, "write_text", write_half):
+            with pytest.raises(OSError):
+                fetcher.fetch("https://example.com/page1")
+        # Neither a truncated cache entry nor the temp file is left behind
+        assert list(cache_dir.iterdir()) == []
+
 
 class TestRetries:
     """Verify the fetcher retries on server errors."""
@@ -132,3 +220,49 @@ class TestRetries:
             fetcher.fetch("https://example.com/broken")
         # Should have tried max_retries times
         assert session_instance.get.call_count == 3
+
+    @patch("scraper.fetcher.random.uniform", side_effect=lambda lo, hi: hi)
+    @patch("scraper.fetcher.time.sleep")
+    @patch("scraper.fetcher.requests.Session")
+    def test_backoff_doubles_up_to_cap(
+        self, mock_session_cls, mock_sleep, mock_uniform
+    ):
+        response_500 = MagicMock()
+        response_500.status_code = 503
+
+        session_instance = MagicMock()
+        session_instance.get.return_value = response_500
+        mock_session_cls.return_value = session_instance
+
+        fetcher = Fetcher(
+            cache_dir=None, delay=0, max_retries=5,
+            backoff_base=1.0, backoff_cap=5.0,
+        )
+        with pytest.raises(RuntimeError):
+            fetcher.fetch("https://example.com/down")
+        # Jitter draws from [0, bound]; bounds double and stop at the cap
+        assert [c.args for c in mock_uniform.call_args_list] == [
+            (0, 1.0), (0, 2.0), (0, 4.0), (0, 5.0),
+        ]
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0, 4.0, 5.0]
+
+
+class TestEncoding:
+    """Tests for decoding Greek pages."""
+
+    @patch("scraper.fetcher.requests.Session")
+    def test_undeclared_charset_decodes_greek_without_detection(
+        self, mock_session_cls
+    ):
+        body = "<p>Ανώτατο Δικαστήριο</p>"
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.encoding = None
+        mock_response.content = body.encode("iso-8859-7")
+
+        session_instance = MagicMock()
+        session_instance.get.return_value = mock_response
+        mock_session_cls.return_value = session_instance
+
+        fetcher = Fetcher(cache_dir=None, delay=0)
+        assert fetcher.fetch("https://example.com/greek") == body
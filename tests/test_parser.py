@@ -21,13 +21,13 @@ FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 def _read_fixture(name: str) -> str:
     """Read an HTML fixture file, handling Greek encoding."""
-    path = FIXTURES_DIR / name
-    for enc in ("utf-8", "iso-8859-7", "windows-1253", "latin-1"):
+    raw = (FIXTURES_DIR / name).read_bytes()
+    for enc in ("utf-8", "iso-8859-7", "windows-1253"):
         try:
-            return path.read_text(encoding=enc)
+            return raw.decode(enc)
         except UnicodeDecodeError:
             continue
-    return path.read_bytes().decode("latin-1")
+    return raw.decode("latin-1")
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,25 @@
+"""Tests for the SQLite progress database."""
+
+from scraper.progress import ProgressDB
+
+
+def test_mark_and_check(tmp_path):
+    db = ProgressDB(str(tmp_path / "progress.db"))
+    assert not db.is_done("/supreme/2025/case1.html")
+    db.mark_done("/supreme/2025/case1.html")
+    db.mark_done("/supreme/2025/case1.html")
+    assert db.is_done("/supreme/2025/case1.html")
+    assert db.count == 1
+    db.close()
+
+
+def test_resume_from_disk(tmp_path):
+    path = str(tmp_path / "nested" / "progress.db")
+    db = ProgressDB(path)
+    db.mark_done("a")
+    db.mark_done("b")
+    db.close()
+
+    reopened = ProgressDB(path)
+    assert reopened.load_all() == {"a", "b"}
+    reopened.close()
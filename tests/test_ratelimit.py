@@ -0,0 +1,51 @@
+"""Tests for the shared adaptive rate limiter."""
+
+from unittest import mock
+
+import pytest
+
+from rag.ratelimit import AdaptiveLimiter, retry_after_seconds
+
+
+def test_backoff_and_recovery():
+    limiter = AdaptiveLimiter(max_rate=4.0, min_rate=0.5, recover_after=2)
+    limiter.record_429()
+    assert limiter.rate == 2.0
+    for _ in range(4):
+        limiter.record_429()
+    assert limiter.rate == 0.5
+
+    limiter.record_success()
+    assert limiter.rate == 0.5
+    limiter.record_success()
+    assert limiter.rate == pytest.approx(0.55)
+
+    limiter.set_max_rate(0.52)
+    assert limiter.rate == 0.52
+    limiter.record_success()
+    limiter.record_success()
+    assert limiter.rate == 0.52
+
+
+def test_wait_spaces_requests_and_honours_retry_after():
+    clock = [100.0]
+    with mock.patch("rag.ratelimit.time") as fake_time:
+        fake_time.monotonic.side_effect = lambda: clock[0]
+        limiter = AdaptiveLimiter(max_rate=2.0)
+        limiter.wait()
+        limiter.wait()
+        limiter.wait()
+        assert [c.args[0] for c in fake_time.sleep.call_args_list] == [0.5, 1.0]
+
+        fake_time.sleep.reset_mock()
+        clock[0] = 200.0
+        limiter.record_429(retry_after=10)
+        limiter.wait()
+        fake_time.sleep.assert_called_once_with(10.0)
+
+
+def test_retry_after_seconds_prefers_header_then_backs_off():
+    with mock.patch("rag.ratelimit.random.uniform", side_effect=lambda lo, hi: hi):
+        assert retry_after_seconds({"Retry-After": "8"}, attempt=0) == 10.0
+        assert retry_after_seconds({}, attempt=2, base=3) == 15.0
+        assert retry_after_seconds(None, attempt=10, cap=30) == 37.5
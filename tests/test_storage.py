@@ -9,7 +9,12 @@ from pathlib import Path
 import pytest
 
 from scraper.parser import CaseEntry
-from scraper.storage import save_court_index, load_court_index, save_updates_index
+from scraper.storage import (
+    save_court_index,
+    load_court_index,
+    load_index_meta,
+    save_updates_index,
+)
 
 
 def _make_entries() -> list[CaseEntry]:
@@ -100,6 +105,21 @@ class TestLoadCourtIndex:
         loaded = load_court_index("nonexistent", str(tmp_path))
         assert loaded is None
 
+    def test_meta_sidecar_has_summary_only(self, tmp_path):
+        save_court_index("supreme", _make_entries(), str(tmp_path))
+        assert (tmp_path / "meta" / "supreme.json").exists()
+        meta = load_index_meta(tmp_path / "supreme.json")
+        assert meta["total"] == 3
+        assert meta["years"] == ["2026", "2025"]
+        assert "by_year" not in meta
+
+    def test_meta_falls_back_to_full_index(self, tmp_path):
+        save_court_index("supreme", _make_entries(), str(tmp_path))
+        (tmp_path / "meta" / "supreme.json").unlink()
+        meta = load_index_meta(tmp_path / "supreme.json")
+        assert meta["court"] == "supreme"
+        assert meta["years"] == ["2026", "2025"]
+
 
 class TestSaveUpdatesIndex:
     """Tests for saving the updates cross-court index."""
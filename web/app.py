@@ -4,16 +4,23 @@ Chat interface with agentic LLM that searches the court case database
 via function calling. Supports streaming, document viewer, and auth.
 """
 
+import asyncio
+import hmac
 import json
 import logging
 import os
+import stat
+from functools import lru_cache
 from pathlib import Path
 
-import markdown
 from dotenv import load_dotenv
 from fastapi import Cookie, FastAPI, Form, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from markdown_it import MarkdownIt
+
+from rag.llm_client import MODELS, chat_stream
 
 load_dotenv()
 
@@ -22,12 +29,32 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
 CASES_PARSED_DIR = PROJECT_ROOT / "data" / "cases_parsed"
+# Resolved once; documents must resolve to a path under this prefix
+_CASES_PARSED_PREFIX = str(CASES_PARSED_DIR.resolve()) + os.sep
 
 APP_PASSWORD = os.environ.get("APP_PASSWORD", "cylaw2026")
 AUTH_COOKIE = "cylaw_auth"
 
+
+class _GZipExceptChat(GZipMiddleware):
+    """GZip responses other than the /chat SSE stream.
+
+    The compressor holds back small writes, which would delay streamed
+    tokens; rendered documents are large and compress several-fold.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/chat":
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 app = FastAPI(title="CyLaw Chat")
+app.add_middleware(_GZipExceptChat, minimum_size=1024)
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+# CommonMark plus GFM tables, matching what the case documents use
+_markdown = MarkdownIt("commonmark").enable("table")
 
 COURT_NAMES = {
     "aad": "Ανώτατο (old Supreme)",
@@ -42,7 +69,7 @@ COURT_NAMES = {
     "clr": "CLR (Cyprus Law Reports)",
 }
 
-# Lazy-loaded retriever
+# Built at startup (see _warm_up); lazily on first use if that failed
 _retriever = None
 
 
@@ -54,8 +81,42 @@ def _get_retriever():
     return _retriever
 
 
+@app.on_event("startup")
+async def _warm_up():
+    """Load the retriever (chromadb, embedding model) before serving.
+
+    Otherwise the first /chat request pays for the heavy imports and
+    model load while blocking the event loop.
+    """
+    try:
+        await asyncio.to_thread(_get_retriever)
+    except Exception:
+        logger.exception("Retriever warm-up failed; will retry on first chat")
+
+
+@lru_cache(maxsize=256)
+def _render_document(path: str, mtime_ns: int) -> tuple[str, str]:
+    """Render a case document to (html, title).
+
+    Keyed on mtime as well as path, so a re-parsed document is rendered
+    afresh instead of being served stale from the cache.
+    """
+    md_text = Path(path).read_text(encoding="utf-8")
+    html_content = _markdown.render(md_text)
+    title = md_text.partition("\n")[0].lstrip("# ").strip()[:200]
+    return html_content, title
+
+
+def _password_matches(value: str | None) -> bool:
+    """Compare against APP_PASSWORD in constant time."""
+    if value is None:
+        return False
+    # Bytes, since compare_digest rejects non-ASCII str (e.g. Greek input)
+    return hmac.compare_digest(value.encode(), APP_PASSWORD.encode())
+
+
 def _check_auth(cylaw_auth: str = Cookie(None)) -> bool:
-    return cylaw_auth == APP_PASSWORD
+    return _password_matches(cylaw_auth)
 
 
 # ── Auth ───────────────────────────────────────────────
@@ -64,7 +125,6 @@ def _check_auth(cylaw_auth: str = Cookie(None)) -> bool:
 async def index(request: Request, cylaw_auth: str = Cookie(None)):
     if not _check_auth(cylaw_auth):
         return templates.TemplateResponse("login.html", {"request": request})
-    from rag.llm_client import MODELS
     return templates.TemplateResponse("chat.html", {
         "request": request,
         "courts": COURT_NAMES,
@@ -74,7 +134,7 @@ async def index(request: Request, cylaw_auth: str = Cookie(None)):
 
 @app.post("/auth")
 async def auth(password: str = Form(...)):
-    if password == APP_PASSWORD:
+    if _password_matches(password):
         response = RedirectResponse("/", status_code=303)
         response.set_cookie(AUTH_COOKIE, APP_PASSWORD, httponly=True, max_age=86400 * 30)
         return response
@@ -110,8 +170,6 @@ async def chat(
     if not messages:
         return JSONResponse({"error": "No messages"}, status_code=400)
 
-    from rag.llm_client import chat_stream
-
     retriever = _get_retriever()
 
     def search_fn(query, court=None, year_from=None, year_to=None):
@@ -157,24 +215,30 @@ async def view_document(
         return JSONResponse({"error": "Unauthorized"}, status_code=401)
 
     # Sanitize path to prevent directory traversal
-    doc_path = CASES_PARSED_DIR / doc_id
     try:
-        doc_path = doc_path.resolve()
-        if not str(doc_path).startswith(str(CASES_PARSED_DIR.resolve())):
-            return JSONResponse({"error": "Invalid path"}, status_code=400)
+        doc_path = (CASES_PARSED_DIR / doc_id).resolve()
     except Exception:
         return JSONResponse({"error": "Invalid path"}, status_code=400)
+    if not str(doc_path).startswith(_CASES_PARSED_PREFIX):
+        return JSONResponse({"error": "Invalid path"}, status_code=400)
 
-    if not doc_path.exists():
+    try:
+        st = doc_path.stat()
+    except OSError:  # missing, or a file used as a directory component
+        return JSONResponse({"error": "Document not found"}, status_code=404)
+    if not stat.S_ISREG(st.st_mode):
         return JSONResponse({"error": "Document not found"}, status_code=404)
 
-    md_text = doc_path.read_text(encoding="utf-8")
-    html_content = markdown.markdown(md_text, extensions=["tables"])
+    # Reading and rendering a long judgment would stall every open chat
+    # stream if done on the event loop
+    html_content, title = await asyncio.to_thread(
+        _render_document, str(doc_path), st.st_mtime_ns
+    )
 
     return JSONResponse({
         "doc_id": doc_id,
         "html": html_content,
-        "title": md_text.split("\n")[0].lstrip("# ").strip()[:200] if md_text else "",
+        "title": title,
     })
 
 